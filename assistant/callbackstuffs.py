@@ -280,6 +280,7 @@ async def update(eve):
     call_back()
     await bash("git pull && pip3 install -r requirements.txt")
     await bash("pip3 install -r requirements.txt --break-system-packages")
+    udB.flush()
     execl(sys.executable, sys.executable, "-m", "pyUltroid")
 
 @callback(re.compile("changes(.*)"), owner=True)
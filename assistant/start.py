@@ -12,7 +12,7 @@ from telethon import Button, events
 from telethon.errors.rpcerrorlist import MessageDeleteForbiddenError
 from telethon.utils import get_display_name
 
-from pyUltroid._misc import SUDO_M, owner_and_sudos
+from pyUltroid._misc import SUDO_M
 from pyUltroid.dB.base import KeyManager
 from pyUltroid.fns.helper import inline_mention
 from strings import get_string
@@ -88,7 +88,7 @@ async def closet(lol):
 async def ultroid(event):
     args = event.pattern_match.group(1).strip()
     keym = KeyManager("BOT_USERS", cast=list)
-    if not keym.contains(event.sender_id) and event.sender_id not in owner_and_sudos():
+    if not keym.contains(event.sender_id) and not SUDO_M.is_owner_or_sudo(event.sender_id):
         keym.add(event.sender_id)
         kak_uiw = udB.get_key("OFF_START_LOG")
         if not kak_uiw or kak_uiw != True:
@@ -103,7 +103,7 @@ async def ultroid(event):
             await event.client.send_message(
                 udB.get_key("LOG_CHANNEL"), msg, buttons=buttons
             )
-    if event.sender_id not in SUDO_M.fullsudos:
+    if not SUDO_M.is_fullsudo(event.sender_id):
         ok = ""
         me = inline_mention(ultroid_bot.me)
         mention = inline_mention(event.sender)
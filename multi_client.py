@@ -26,6 +26,8 @@ for z in range(5):
             stderr=None,
             stdout=None,
             cwd=None,
+            # clients share the database, keep their caches in sync.
+            env={**os.environ, "DB_SYNC": os.environ.get("DB_SYNC", "True")},
         )
 
 loop = asyncio.get_event_loop()
@@ -12,12 +12,14 @@ from telethon.errors.rpcerrorlist import UserNotParticipantError
 from telethon.tl.functions.channels import GetParticipantRequest
 from telethon.utils import get_display_name
 
+from pyUltroid._misc._pipeline import chat_feature
 from pyUltroid.dB import stickers
 from pyUltroid.dB.echo_db import check_echo
 from pyUltroid.dB.forcesub_db import get_forcesetting
 from pyUltroid.dB.gban_mute_db import is_gbanned
 from pyUltroid.dB.greetings_db import get_goodbye, get_welcome, must_thank
 from pyUltroid.dB.nsfw_db import is_profan
+from pyUltroid.dB.username_db import get_username, set_username
 from pyUltroid.fns.helper import inline_mention
 from pyUltroid.fns.tools import async_searcher, create_tl_btn, get_chatbot_reply
 
@@ -193,7 +195,21 @@ async def DummyHandler(ult):
             await ult.reply(file=med)
 
 
-@ultroid_bot.on(events.NewMessage(incoming=True))
+def _chatbot_chats():
+    # username logging works in every chat.
+    if udB.get_key("USERNAME_LOG"):
+        return None
+    chats = set()
+    for key in ["ECHO", "CHATBOT_USERS", "PROFANITY"]:
+        chats.update(udB.get_key(key) or {})
+    return chats
+
+
+@chat_feature(
+    ["ECHO", "CHATBOT_USERS", "PROFANITY", "USERNAME_LOG"],
+    chats=_chatbot_chats,
+    incoming=True,
+)
 async def chatBot_replies(e):
     sender = await e.get_sender()
     if not isinstance(sender, types.User) or sender.bot:
@@ -228,8 +244,7 @@ async def uname_change(e):
 
 async def uname_stuff(id, uname, name):
     if udB.get_key("USERNAME_LOG"):
-        old_ = udB.get_key("USERNAME_DB") or {}
-        old = old_.get(id)
+        old = await get_username(id)
         # Ignore Name Logs
         if old and old == uname:
             return
@@ -249,5 +264,4 @@ async def uname_stuff(id, uname, name):
                 get_string("can_4").format(f"[{name}](tg://user?id={id})", uname),
             )
 
-        old_[id] = uname
-        udB.set_key("USERNAME_DB", old_)
+        await set_username(id, uname)
@@ -12,8 +12,7 @@ __doc__ = get_help("help_afk")
 
 import asyncio
 
-from telethon import events
-
+from pyUltroid._misc._pipeline import chat_feature
 from pyUltroid.dB.afk_db import add_afk, del_afk, is_afk
 from pyUltroid.dB.base import KeyManager
 
@@ -55,13 +54,6 @@ async def set_afk(event):
                 media = reply.file.id
     await event.eor("`Done`", time=2)
     add_afk(text, media_type, media)
-    ultroid_bot.add_handler(remove_afk, events.NewMessage(outgoing=True))
-    ultroid_bot.add_handler(
-        on_afk,
-        events.NewMessage(
-            incoming=True, func=lambda e: bool(e.mentioned or e.is_private)
-        ),
-    )
     msg1, msg2 = None, None
     if text and media:
         if "sticker" in media_type:
@@ -92,6 +84,12 @@ async def set_afk(event):
     await asst.send_message(LOG_CHANNEL, msg1.text)
 
 
+def _afk_chats():
+    # afk works in every chat, while it is set.
+    return None if udB.get_key("AFK_DB") else ()
+
+
+@chat_feature(["AFK_DB"], chats=_afk_chats, incoming=False)
 async def remove_afk(event):
     if event.is_private and udB.get_key("PMSETTING") and not is_approved(event.chat_id):
         return
@@ -113,6 +111,12 @@ async def remove_afk(event):
         await off.delete()
 
 
+@chat_feature(
+    ["AFK_DB"],
+    chats=_afk_chats,
+    incoming=True,
+    check=lambda e: bool(e.mentioned or e.is_private),
+)
 async def on_afk(event):
     if event.is_private and Redis("PMSETTING") and not is_approved(event.chat_id):
         return
@@ -153,13 +157,3 @@ async def on_afk(event):
     old_afk_msg.append(msg1)
     if msg2:
         old_afk_msg.append(msg2)
-
-
-if udB.get_key("AFK_DB"):
-    ultroid_bot.add_handler(remove_afk, events.NewMessage(outgoing=True))
-    ultroid_bot.add_handler(
-        on_afk,
-        events.NewMessage(
-            incoming=True, func=lambda e: bool(e.mentioned or e.is_private)
-        ),
-    )
@@ -11,58 +11,118 @@ __doc__ = get_help("help_antiflood")
 
 
 import re
+import time
+from collections import OrderedDict, deque
 
-from telethon.events import NewMessage as NewMsg
-
+from pyUltroid._misc._pipeline import chat_feature
 from pyUltroid.dB import DEVLIST
 from pyUltroid.dB.antiflood_db import get_flood, get_flood_limit, rem_flood, set_flood
 from pyUltroid.fns.admins import admin_check
+from pyUltroid.fns.batch import BatchQueue
+
+from . import (
+    LOGS,
+    Button,
+    Redis,
+    asst,
+    callback,
+    eod,
+    get_string,
+    udB,
+    ultroid_bot,
+    ultroid_cmd,
+)
 
-from . import Button, Redis, asst, callback, eod, get_string, ultroid_bot, ultroid_cmd
+# messages counted against flood limit, are of last this many seconds.
+FLOOD_WINDOW = 10
+# users tracked per chat, least recently active ones are dropped.
+_MAX_USERS = 500
+_ADMIN_TTL = 300
 
+# chat_id -> user_id -> times of recent messages
 _check_flood = {}
+# (chat_id, user_id) -> (is_admin, checked_at)
+_admins = {}
+
+
+def _prune_chats(key=None):
+    enabled = {str(chat) for chat in get_flood()}
+    for chat in list(_check_flood):
+        if str(chat) not in enabled:
+            del _check_flood[chat]
+
+
+udB.watch("ANTIFLOOD", _prune_chats)
+
+
+def _is_flooding(chat, user, limit):
+    users = _check_flood.setdefault(chat, OrderedDict())
+    times = users.get(user)
+    if not times or times.maxlen != limit:
+        times = users[user] = deque(times or (), maxlen=limit)
+    users.move_to_end(user)
+    if len(users) > _MAX_USERS:
+        users.popitem(last=False)
+    now = time.monotonic()
+    times.append(now)
+    return len(times) == limit and now - times[0] <= FLOOD_WINDOW
+
+
+async def _is_admin(event):
+    key = (event.chat_id, event.sender_id)
+    if (cached := _admins.get(key)) and time.monotonic() - cached[1] < _ADMIN_TTL:
+        return cached[0]
+    if len(_admins) > 5000:
+        _admins.clear()
+    result = bool(await admin_check(event, silent=True))
+    _admins[key] = (result, time.monotonic())
+    return result
+
+
+async def _mute_users(chat, users):
+    muted = []
+    for user, name in users:
+        try:
+            await ultroid_bot.edit_permissions(chat, user, send_messages=False)
+            muted.append((user, name))
+        except Exception as er:
+            LOGS.debug(f"Antiflood: can't mute {user} in {chat}: {er}")
+    if not muted:
+        return
+    title = getattr(await ultroid_bot.get_entity(chat), "title", chat)
+    mentions = ", ".join(f"[{name}](tg://user?id={user})" for user, name in muted)
+    try:
+        await ultroid_bot.send_message(
+            chat, f"#AntiFlood\n\n{mentions}\n{get_string('antiflood_3')}"
+        )
+    except Exception as er:
+        LOGS.debug(er)
+    await asst.send_message(
+        int(Redis("LOG_CHANNEL")),
+        f"#Antiflood\n\n`Muted `{mentions}` in {title}`",
+        buttons=[
+            [Button.inline(f"Unmute {name}"[:64], data=f"anti_{user}_{chat}")]
+            for user, name in muted
+        ],
+    )
 
-if Redis("ANTIFLOOD"):
 
-    @ultroid_bot.on(
-        NewMsg(
-            chats=list(get_flood().keys()),
-        ),
-    )
-    async def flood_checm(event):
-        count = 1
-        chat = (await event.get_chat()).title
-        if event.chat_id in _check_flood.keys():
-            if event.sender_id == list(_check_flood[event.chat_id].keys())[0]:
-                count = _check_flood[event.chat_id][event.sender_id]
-                _check_flood[event.chat_id] = {event.sender_id: count + 1}
-            else:
-                _check_flood[event.chat_id] = {event.sender_id: count}
-        else:
-            _check_flood[event.chat_id] = {event.sender_id: count}
-        if await admin_check(event, silent=True) or getattr(event.sender, "bot", None):
-            return
-        if event.sender_id in DEVLIST:
-            return
-        if _check_flood[event.chat_id][event.sender_id] >= int(
-            get_flood_limit(event.chat_id)
-        ):
-            try:
-                name = event.sender.first_name
-                await event.client.edit_permissions(
-                    event.chat_id, event.sender_id, send_messages=False
-                )
-                del _check_flood[event.chat_id]
-                await event.reply(f"#AntiFlood\n\n{get_string('antiflood_3')}")
-                await asst.send_message(
-                    int(Redis("LOG_CHANNEL")),
-                    f"#Antiflood\n\n`Muted `[{name}](tg://user?id={event.sender_id})` in {chat}`",
-                    buttons=Button.inline(
-                        "Unmute", data=f"anti_{event.sender_id}_{event.chat_id}"
-                    ),
-                )
-            except BaseException:
-                pass
+# during a raid, users muted within a second are reported together.
+_to_mute = BatchQueue(_mute_users, delay=1, size=20)
+
+
+@chat_feature(["ANTIFLOOD"])
+async def flood_checm(event):
+    limit = get_flood_limit(event.chat_id)
+    if not limit or event.sender_id in DEVLIST:
+        return
+    if not _is_flooding(event.chat_id, event.sender_id, int(limit)):
+        return
+    if getattr(event.sender, "bot", None) or await _is_admin(event):
+        return
+    _check_flood[event.chat_id].pop(event.sender_id, None)
+    name = getattr(event.sender, "first_name", None) or event.sender_id
+    _to_mute.add(event.chat_id, (event.sender_id, name))
 
 
 @callback(
@@ -102,10 +162,7 @@ async def setflood(e):
 )
 async def remove_flood(e):
     hmm = rem_flood(e.chat_id)
-    try:
-        del _check_flood[e.chat_id]
-    except BaseException:
-        pass
+    _check_flood.pop(e.chat_id, None)
     if hmm:
         return await e.eor(get_string("antiflood_1"), time=5)
     await e.eor(get_string("antiflood_2"), time=5)
@@ -10,14 +10,26 @@ from . import get_help
 __doc__ = get_help("help_blacklist")
 
 
+import re
+
+from pyUltroid._misc._pipeline import chat_feature
 from pyUltroid.dB.blacklist_db import (
     add_blacklist,
-    get_blacklist,
+    get_blacklist_matcher,
     list_blacklist,
     rem_blacklist,
 )
+from pyUltroid.fns.batch import BatchQueue
+
+from . import LOGS, get_string, ultroid_bot, ultroid_cmd
 
-from . import events, get_string, udB, ultroid_bot, ultroid_cmd
+
+def _entries(text):
+    """Words of 'text', keeping phrases in quotes together."""
+    return [
+        (phrase or word).lower()
+        for phrase, word in re.findall(r'"([^"]+)"|(\S+)', text)
+    ]
 
 
 @ultroid_cmd(pattern="blacklist( (.*)|$)", admins_only=True)
@@ -27,10 +39,8 @@ async def af(e):
     if not (wrd):
         return await e.eor(get_string("blk_1"), time=5)
     wrd = e.text[11:]
-    heh = wrd.split(" ")
-    for z in heh:
-        add_blacklist(int(chat), z.lower())
-    ultroid_bot.add_handler(blacklist, events.NewMessage(incoming=True))
+    for z in _entries(wrd):
+        add_blacklist(int(chat), z)
     await e.eor(get_string("blk_2").format(wrd))
 
 
@@ -41,9 +51,8 @@ async def rf(e):
     if not wrd:
         return await e.eor(get_string("blk_3"), time=5)
     wrd = e.text[14:]
-    heh = wrd.split(" ")
-    for z in heh:
-        rem_blacklist(int(chat), z.lower())
+    for z in _entries(wrd):
+        rem_blacklist(int(chat), z)
     await e.eor(get_string("blk_4").format(wrd))
 
 
@@ -55,15 +64,18 @@ async def lsnote(e):
     await e.eor(get_string("blk_6"))
 
 
-async def blacklist(e):
-    if x := get_blacklist(e.chat_id):
-        text = e.text.lower().split()
-        if any((z in text) for z in x):
-            try:
-                await e.delete()
-            except BaseException:
-                pass
+async def _delete_messages(chat, ids):
+    try:
+        await ultroid_bot.delete_messages(chat, ids)
+    except Exception as er:
+        LOGS.exception(er)
 
 
-if udB.get_key("BLACKLIST_DB"):
-    ultroid_bot.add_handler(blacklist, events.NewMessage(incoming=True))
+# messages of a spam wave are deleted together, instead of one by one.
+_to_delete = BatchQueue(_delete_messages, delay=0.5)
+
+
+@chat_feature(["BLACKLIST_DB"], incoming=True)
+async def blacklist(e):
+    if e.text and get_blacklist_matcher(e.chat_id).search(e.text):
+        _to_delete.add(e.chat_id, e.id)
@@ -206,6 +206,7 @@ async def restartbt(ult):
     udB.set_key("_RESTART", f"{who}_{ult.chat_id}_{ok.id}")
     await bash("git pull && pip3 install -r requirements.txt")
     await bash("pip3 install -r requirements.txt --break-system-packages")
+    udB.flush()
     if len(sys.argv) > 1:
         os.execl(sys.executable, sys.executable, "main.py")
     else:
@@ -320,6 +321,7 @@ async def _(e):
         await bash("pip3 install -r requirements.txt --break-system-packages")
         call_back()
         await xx.edit(get_string("upd_7"))
+        udB.flush()
         os.execl(sys.executable, "python3", "-m", "pyUltroid")
         # return
     m = await updater()
@@ -36,7 +36,7 @@ async def broadcast_adder(event):
             for e in await event.client.get_dialogs()
             if (e.is_group or e.is_channel)
         ]
-        new = 0
+        new = []
         for i in chats:
             try:
                 if (
@@ -44,22 +44,21 @@ async def broadcast_adder(event):
                     and (i.creator or i.admin_rights)
                     and not KeyM.contains(i.id)
                 ):
-                    new += 1
                     cid = f"-100{i.id}"
-                    KeyM.add(int(cid))
+                    new.append(int(cid))
             except Exception as Ex:
                 LOGS.exception(Ex)
-        await x.edit(get_string("bd_3").format(KeyM.count(), new))
+        KeyM.add_many(new)
+        await x.edit(get_string("bd_3").format(KeyM.count(), len(new)))
         return
     if event.reply_to_msg_id:
         previous_message = await event.get_reply_message()
         raw_text = previous_message.text
         lines = raw_text.split("\n")
         length = len(lines)
-        for line_number in range(1, length - 2):
-            channel_id = lines[line_number][4:-1]
-            if not KeyM.contains(channel_id):
-                KeyM.add(channel_id)
+        KeyM.add_many(
+            [lines[line_number][4:-1] for line_number in range(1, length - 2)]
+        )
         await x.edit(get_string("bd_4"))
         await asyncio.sleep(3)
         await event.delete()
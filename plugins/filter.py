@@ -10,15 +10,21 @@ from . import get_help
 __doc__ = get_help("help_filter")
 
 import os
-import re
 
 from telethon.tl.types import User
 from telethon.utils import pack_bot_file_id
 
-from pyUltroid.dB.filter_db import add_filter, get_filter, list_filter, rem_filter
+from pyUltroid._misc._pipeline import chat_feature
+from pyUltroid.dB.filter_db import (
+    add_filter,
+    get_filter,
+    get_filter_matcher,
+    list_filter,
+    rem_filter,
+)
 from pyUltroid.fns.tools import create_tl_btn, format_btn, get_msg_button
 
-from . import events, get_string, mediainfo, udB, ultroid_bot, ultroid_cmd, upload_file
+from . import get_string, mediainfo, ultroid_cmd, upload_file
 from ._inline import something
 
 
@@ -57,7 +63,6 @@ async def af(e):
             txt, btn = get_msg_button(wt.text)
         add_filter(chat, wrd, txt, None, btn)
     await e.eor(get_string("flr_4").format(wrd))
-    ultroid_bot.add_handler(filter_func, events.NewMessage())
 
 
 @ultroid_cmd(pattern="remfilter( (.*)|$)")
@@ -78,15 +83,16 @@ async def lsnote(e):
     await e.eor(get_string("flr_6"))
 
 
+@chat_feature(["FILTERS"])
 async def filter_func(e):
     if isinstance(e.sender, User) and e.sender.bot:
         return
     xx = (e.text).lower()
     chat = e.chat_id
     if x := get_filter(chat):
+        found = get_filter_matcher(chat).find(xx)
         for c in x:
-            pat = r"( |^|[^\w])" + re.escape(c) + r"( |$|[^\w])"
-            if re.search(pat, xx):
+            if c in found:
                 if k := x.get(c):
                     msg = k["msg"]
                     media = k["media"]
@@ -94,7 +100,3 @@ async def filter_func(e):
                         btn = create_tl_btn(k["button"])
                         return await something(e, msg, media, btn)
                     await e.reply(msg, file=media)
-
-
-if udB.get_key("FILTERS"):
-    ultroid_bot.add_handler(filter_func, events.NewMessage())
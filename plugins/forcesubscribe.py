@@ -33,13 +33,13 @@ from telethon.tl.types import (
     User,
 )
 
+from pyUltroid._misc._pipeline import chat_feature
 from pyUltroid.dB.forcesub_db import add_forcesub, get_forcesetting, rem_forcesub
 
 from . import (
     LOGS,
     asst,
     callback,
-    events,
     get_string,
     in_pattern,
     inline_mention,
@@ -62,7 +62,6 @@ async def addfor(e):
         return await e.eor(get_string("fsub_2"), time=5)
     add_forcesub(e.chat_id, match)
     await e.eor("Added ForceSub in This Chat !")
-    ultroid_bot.add_handler(force_sub, events.NewMessage(incoming=True))
 
 
 @ultroid_cmd(pattern="remfsub$")
@@ -131,6 +130,7 @@ async def diesoon(e):
     await e.edit(get_string("fsub_8"))
 
 
+@chat_feature(["FORCESUB"], incoming=True)
 async def force_sub(ult):
     if not udB.get_key("FORCESUB"):
         return
@@ -173,7 +173,3 @@ async def force_sub(ult):
         LOGS.info(e)
     res = await ultroid_bot.inline_query(asst.me.username, f"fsub {user.id}_{joinchat}")
     await res[0].click(ult.chat_id, reply_to=ult.id)
-
-
-if udB.get_key("FORCESUB"):
-    ultroid_bot.add_handler(force_sub, events.NewMessage(incoming=True))
@@ -26,16 +26,16 @@
     d- days
     Mute user in current chat with time.
 """
-from telethon import events
 from telethon.utils import get_display_name
 
+from pyUltroid._misc._pipeline import chat_feature
 from pyUltroid.dB.mute_db import is_muted, mute, unmute
 from pyUltroid.fns.admins import ban_time
 
 from . import asst, eod, get_string, inline_mention, ultroid_bot, ultroid_cmd
 
 
-@ultroid_bot.on(events.NewMessage(incoming=True))
+@chat_feature(["MUTE"], incoming=True)
 async def watcher(event):
     if is_muted(event.chat_id, event.sender_id):
         await event.delete()
@@ -25,10 +25,11 @@ import os
 from . import upload_file as uf
 from telethon.utils import pack_bot_file_id
 
+from pyUltroid._misc._pipeline import chat_feature
 from pyUltroid.dB.notes_db import add_note, get_notes, list_note, rem_note
 from pyUltroid.fns.tools import create_tl_btn, format_btn, get_msg_button
 
-from . import events, get_string, mediainfo, udB, ultroid_bot, ultroid_cmd
+from . import get_string, mediainfo, ultroid_cmd
 from ._inline import something
 
 
@@ -69,7 +70,6 @@ async def an(e):
             txt, btn = get_msg_button(wt.text)
         add_note(chat, wrd, txt, None, btn)
     await e.eor(get_string("notes_2").format(wrd))
-    ultroid_bot.add_handler(notes, events.NewMessage())
 
 
 @ultroid_cmd(pattern="remnote( (.*)|$)", admins_only=True)
@@ -92,6 +92,7 @@ async def lsnote(e):
     await e.eor(get_string("notes_5"))
 
 
+@chat_feature(["NOTE"])
 async def notes(e):
     xx = [z.replace("#", "") for z in e.text.lower().split() if z.startswith("#")]
     for word in xx:
@@ -104,7 +105,3 @@ async def notes(e):
             await e.client.send_message(
                 e.chat_id, msg, file=media, reply_to=e.reply_to_msg_id or e.id
             )
-
-
-if udB.get_key("NOTE"):
-    ultroid_bot.add_handler(notes, events.NewMessage())
@@ -23,9 +23,10 @@ try:
 except ImportError:
     detector = None
     LOGS.error("nsfwfilter: 'Profanitydetector' not installed!")
+from pyUltroid._misc._pipeline import chat_feature
 from pyUltroid.dB.nsfw_db import is_nsfw, nsfw_chat, rem_nsfw
 
-from . import HNDLR, async_searcher, eor, events, udB, ultroid_bot, ultroid_cmd
+from . import HNDLR, async_searcher, eor, udB, ultroid_bot, ultroid_cmd
 
 
 @ultroid_cmd(pattern="addnsfw( (.*)|$)", admins_only=True)
@@ -38,7 +39,6 @@ async def addnsfw(e):
     if not action or ("ban" or "kick" or "mute") not in action:
         action = "mute"
     nsfw_chat(e.chat_id, action)
-    ultroid_bot.add_handler(nsfw_check, events.NewMessage(incoming=True))
     await e.eor("Added This Chat To Nsfw Filter")
 
 
@@ -51,6 +51,7 @@ async def remnsfw(e):
 NWARN = {}
 
 
+@chat_feature(["NSFW"], incoming=True)
 async def nsfw_check(e):
     chat = e.chat_id
     action = is_nsfw(chat)
@@ -143,7 +144,3 @@ async def nsfw_check(e):
                     chat,
                     f"**NSFW Warn 1/3** To [{e.sender.first_name}](tg://user?id={e.sender_id})\nNSFW prohibited! Repeated violation would lead to {action}",
                 )
-
-
-if udB.get_key("NSFW"):
-    ultroid_bot.add_handler(nsfw_check, events.NewMessage(incoming=True))
@@ -25,10 +25,11 @@ from . import upload_file as uf
 from telethon.utils import pack_bot_file_id
 
 from pyUltroid._misc import sudoers
+from pyUltroid._misc._pipeline import chat_feature
 from pyUltroid.dB.snips_db import add_snip, get_snips, list_snip, rem_snip
 from pyUltroid.fns.tools import create_tl_btn, format_btn, get_msg_button
 
-from . import events, get_string, mediainfo, udB, ultroid_bot, ultroid_cmd
+from . import get_string, mediainfo, udB, ultroid_bot, ultroid_cmd
 from ._inline import something
 
 
@@ -68,7 +69,6 @@ async def an(e):
             txt, btn = get_msg_button(wt.text)
         add_snip(wrd, txt, None, btn)
     await e.eor(f"Done : snip `${wrd}` Saved.")
-    ultroid_bot.add_handler(add_snips, events.NewMessage())
 
 
 @ultroid_cmd(pattern="remsnip( (.*)|$)")
@@ -90,6 +90,8 @@ async def lsnote(e):
     await e.eor("No Snips Found Here")
 
 
+# snips work in every chat.
+@chat_feature(["SNIP"], chats=lambda: None if udB.get_key("SNIP") else ())
 async def add_snips(e):
     if not e.out and e.sender_id not in sudoers():
         return
@@ -110,7 +112,3 @@ async def add_snips(e):
                     btn = create_tl_btn(k["button"])
                     return await something(e, msg, media, btn, reply=None)
                 await ultroid_bot.send_message(e.chat_id, msg, file=media)
-
-
-if udB.get_key("SNIP"):
-    ultroid_bot.add_handler(add_snips, events.NewMessage())
@@ -15,13 +15,21 @@
 
 • `{i}usage db`
    Get database storage usage.
+
+• `{i}perf` | `{i}perf reset`
+   Get calls, latency and errors of commands.
+
+• `{i}bootstats`
+   Get time, memory and handlers taken by plugins at startup.
 """
 
 import math
 import shutil
 from random import choice
 
+from pyUltroid._misc._perf import PERF
 from pyUltroid.fns import some_random_headers
+from pyUltroid.startup._profiler import BOOT
 
 from . import (
     HOSTED_ON,
@@ -48,6 +56,19 @@ async def usage_finder(event):
         await x.edit(db_usage())
 
 
+@ultroid_cmd(pattern="perf( reset|$)")
+async def perf_stats(event):
+    if event.pattern_match.group(1):
+        PERF.reset()
+        return await event.eor("`Cleared stats of commands.`", time=5)
+    await event.eor(PERF.report())
+
+
+@ultroid_cmd(pattern="bootstats$")
+async def boot_stats(event):
+    await event.eor(BOOT.report())
+
+
 def simple_usage():
     try:
         import psutil
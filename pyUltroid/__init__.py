@@ -26,7 +26,7 @@ if run_as_module:
     from .startup._database import UltroidDB
     from .startup.BaseClient import UltroidClient
     from .startup.connections import validate_session, vc_connection
-    from .startup.funcs import _version_changes, autobot, enable_inline, update_envs
+    from .startup.funcs import _version_changes, autobot, update_envs
     from .startup.session_gen import Session
     from .version import ultroid_version
 
@@ -41,6 +41,8 @@ if run_as_module:
     _ignore_eval = []
 
     udB = UltroidDB()
+    if Var.DB_PREFETCH:
+        udB.prefetch()
     update_envs()
 
     LOGS.info(f"Connecting to {udB.name}...")
@@ -119,8 +121,6 @@ if run_as_module:
                 )
             except Exception as er:
                 LOGS.exception(er)
-    elif asst and not asst.me.bot_inline_placeholder and asst._bot:
-        ultroid_bot.run_in_loop(enable_inline(ultroid_bot, asst.me.username))
 
     vcClient = vc_connection(udB, ultroid_bot)
 
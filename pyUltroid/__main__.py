@@ -14,10 +14,15 @@ def main():
     import time
 
     from .fns.helper import bash, time_formatter, updater
+    from .startup._graph import StartupGraph
+    from .startup._profiler import BOOT
     from .startup.funcs import (
         WasItRestart,
         autopilot,
+        autoupdate_local_database,
         customize,
+        enable_inline,
+        perf_summary,
         plug,
         ready,
         startup_stuff,
@@ -37,10 +42,9 @@ def main():
     ):
         ultroid_bot.run_in_loop(bash("bash installer.sh"))
 
+        udB.flush()
         os.execl(sys.executable, sys.executable, "-m", "pyUltroid")
 
-    ultroid_bot.run_in_loop(startup_stuff())
-
     ultroid_bot.me.phone = None
 
     if not ultroid_bot.me.bot:
@@ -48,8 +52,6 @@ def main():
 
     LOGS.info("Initialising...")
 
-    ultroid_bot.run_in_loop(autopilot())
-
     pmbot = udB.get_key("PMBOT")
     manager = udB.get_key("MANAGER")
     addons = udB.get_key("ADDONS") or Var.ADDONS
@@ -61,8 +63,6 @@ def main():
         _plugins = "autocorrect autopic audiotools compressor forcesubscribe fedutils gdrive glitch instagram nsfwfilter nightmode pdftools profanityfilter writer youtube"
         udB.set_key("EXCLUDE_OFFICIAL", _plugins)
 
-    load_other_plugins(addons=addons, pmbot=pmbot, manager=manager, vcbot=vcbot)
-
     suc_msg = """
             ----------------------------------------------------------------------
                 Ultroid has been deployed! Visit @TheUltroid for updates!!
@@ -72,25 +72,67 @@ def main():
     # for channel plugins
     plugin_channels = udB.get_key("PLUGIN_CHANNEL")
 
-    # Customize Ultroid Assistant...
-    ultroid_bot.run_in_loop(customize())
+    # Steps, which don't depend on each other run together; background
+    # ones finish after handlers are live.
+    graph = StartupGraph(on_step=BOOT.add, on_done=BOOT.save)
+    graph.add("startup_stuff", startup_stuff, timeout=120)
+    graph.add("autopilot", autopilot, timeout=120)
+    ultroid_bot.run_in_loop(graph.run())
+
+    # Outside of loop, as plugins may run things in it, while importing.
+    with BOOT.measure("load_plugins"):
+        load_other_plugins(addons=addons, pmbot=pmbot, manager=manager, vcbot=vcbot)
+
+    # Background steps are added after plugins are loaded, so that their
+    # timeouts don't run out, while loop is blocked by loading.
+    # Both talk to @BotFather, so one after other.
+    botfather = []
+    if not BOT_MODE and asst and asst._bot and not asst.me.bot_inline_placeholder:
+        graph.add(
+            "enable_inline",
+            lambda: enable_inline(ultroid_bot, asst.me.username),
+            timeout=60,
+            background=True,
+        )
+        botfather.append("enable_inline")
 
-    # Load Addons from Plugin Channels.
-    if plugin_channels:
-        ultroid_bot.run_in_loop(plug(plugin_channels))
+    # Customize Ultroid Assistant...
+    graph.add(
+        "customize",
+        customize,
+        needs=["autopilot", *botfather],
+        timeout=120,
+        background=True,
+    )
 
     # Send/Ignore Deploy Message..
     if not udB.get_key("LOG_OFF"):
-        ultroid_bot.run_in_loop(ready())
+        graph.add("ready", ready, needs=["autopilot"], timeout=60, background=True)
 
     # Edit Restarting Message (if It's restarting)
-    ultroid_bot.run_in_loop(WasItRestart(udB))
+    graph.add("WasItRestart", lambda: WasItRestart(udB), timeout=30, background=True)
+
+    # Load Addons from Plugin Channels.
+    if plugin_channels:
+        graph.add(
+            "plug", lambda: plug(plugin_channels), timeout=600, background=True
+        )
+    ultroid_bot.run_in_loop(graph.run())
+
+    # Keep backup of local database in Telegram.
+    if udB.name == "SQLite":
+        asst.loop.create_task(autoupdate_local_database())
+
+    # Summary of command timings, every 'PERF_SUMMARY' hours.
+    if udB.get_key("PERF_SUMMARY"):
+        asst.loop.create_task(perf_summary(udB.get_key("PERF_SUMMARY")))
 
     try:
         cleanup_cache()
     except BaseException:
         pass
 
+    BOOT.finish(time.time() - start_time)
     LOGS.info(
         f"Took {time_formatter((time.time() - start_time)*1000)} to start •ULTROID•"
     )
@@ -16,19 +16,39 @@ class _SudoManager:
     def __init__(self):
         self.db = None
         self.owner = None
-        self._owner_sudos = []
+        # sets of ids, built on first use and dropped when their keys change.
+        self._sets = {}
 
     def _init_db(self):
         if not self.db:
             from .. import udB
 
             self.db = udB
+            for key in ("OWNER_ID", "SUDOS", "FULLSUDO", "VC_SUDOS"):
+                udB.watch(key, self._reset)
         return self.db
 
+    def _reset(self, key=None):
+        if key == "OWNER_ID":
+            self.owner = None
+        self._sets.clear()
+
+    def _get_owner(self):
+        if not self.owner:
+            self.owner = self._init_db().get_key("OWNER_ID")
+        return self.owner
+
+    def _cached(self, name, build):
+        if name not in self._sets:
+            self._init_db()
+            self._sets[name] = build()
+        return self._sets[name]
+
+    def _sudos(self):
+        return self._cached("sudos", lambda: tuple(self.db.get_key("SUDOS") or []))
+
     def get_sudos(self):
-        db = self._init_db()
-        SUDOS = db.get_key("SUDOS")
-        return SUDOS or []
+        return list(self._sudos())
 
     @property
     def should_allow_sudo(self):
@@ -36,25 +56,38 @@ class _SudoManager:
         return db.get_key("SUDO")
 
     def owner_and_sudos(self):
-        if not self.owner:
-            db = self._init_db()
-            self.owner = db.get_key("OWNER_ID")
-        return [self.owner, *self.get_sudos()]
+        return [self._get_owner(), *self._sudos()]
+
+    def _fullsudos(self):
+        fsudos = self.db.get_key("FULLSUDO")
+        fsudos = str(fsudos).split() if fsudos else []
+        return (*map(int, fsudos), self._get_owner())
 
     @property
     def fullsudos(self):
-        db = self._init_db()
-        fsudos = db.get("FULLSUDO")
-        if not self.owner:
-            self.owner = db.get_key("OWNER_ID")
-        if not fsudos:
-            return [self.owner]
-        fsudos = fsudos.split()
-        fsudos.append(self.owner)
-        return [int(_) for _ in fsudos]
+        return list(self._cached("fullsudos", self._fullsudos))
 
     def is_sudo(self, id_):
-        return bool(id_ in self.get_sudos())
+        return id_ in self._cached("sudo_set", lambda: frozenset(self._sudos()))
+
+    def is_owner_or_sudo(self, id_):
+        return id_ in self._cached(
+            "owner_sudo_set", lambda: frozenset(self.owner_and_sudos())
+        )
+
+    def is_fullsudo(self, id_):
+        return id_ in self._cached(
+            "fullsudo_set", lambda: frozenset(self._cached("fullsudos", self._fullsudos))
+        )
+
+    def vc_auths(self):
+        return self._cached(
+            "vc_auths",
+            lambda: frozenset(
+                int(_)
+                for _ in [*self.owner_and_sudos(), *(self.db.get_key("VC_SUDOS") or [])]
+            ),
+        )
 
 
 SUDO_M = _SudoManager()
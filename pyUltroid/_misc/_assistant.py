@@ -16,7 +16,9 @@ from telethon.tl.types import InputWebDocument
 
 from .. import LOGS, asst, udB, ultroid_bot
 from ..fns.admins import admin_check
-from . import append_or_update, owner_and_sudos
+from . import SUDO_M, append_or_update
+from ._perf import PERF
+from ._router import literal_prefix
 
 OWNER = ultroid_bot.full_name
 
@@ -50,12 +52,13 @@ def asst_cmd(pattern=None, load=None, owner=False, **kwargs):
     def ult(func):
         if pattern:
             kwargs["pattern"] = re.compile(f"^/{pattern}")
+        perf_name = f"/{literal_prefix(pattern) or func.__name__}"
 
         async def handler(event):
-            if owner and event.sender_id not in owner_and_sudos():
+            if owner and not SUDO_M.is_owner_or_sudo(event.sender_id):
                 return
             try:
-                await func(event)
+                await PERF.run(perf_name, func, event)
             except Exception as er:
                 LOGS.exception(er)
 
@@ -78,10 +81,10 @@ def callback(data=None, from_users=[], admins=False, owner=False, **kwargs):
                 return
             if from_users and event.sender_id not in from_users:
                 return await event.answer("Not for You!", alert=True)
-            if owner and event.sender_id not in owner_and_sudos():
+            if owner and not SUDO_M.is_owner_or_sudo(event.sender_id):
                 return await event.answer(f"This is {OWNER}'s bot!!")
             try:
-                await func(event)
+                await PERF.run(f"callback:{func.__name__}", func, event)
             except Exception as er:
                 LOGS.exception(er)
 
@@ -95,7 +98,7 @@ def in_pattern(pattern=None, owner=False, **kwargs):
 
     def don(func):
         async def wrapper(event):
-            if owner and event.sender_id not in owner_and_sudos():
+            if owner and not SUDO_M.is_owner_or_sudo(event.sender_id):
                 res = [
                     await event.builder.article(
                         title="Ultroid Userbot",
@@ -117,7 +120,7 @@ def in_pattern(pattern=None, owner=False, **kwargs):
                     switch_pm_param="start",
                 )
             try:
-                await func(event)
+                await PERF.run(f"inline:{pattern or func.__name__}", func, event)
             except QueryIdInvalidError:
                 pass
             except Exception as er:
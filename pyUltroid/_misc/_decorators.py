@@ -6,13 +6,15 @@
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
 import asyncio
+import hashlib
 import inspect
 import re
+import subprocess
 import sys
 from io import BytesIO
 from pathlib import Path
 from time import gmtime, strftime
-from traceback import format_exc
+from traceback import extract_tb, format_exc
 
 from telethon import Button
 from telethon import __version__ as telever
@@ -42,11 +44,13 @@ from .. import _ignore_eval
 from ..dB import DEVLIST
 from ..dB._core import LIST, LOADED
 from ..fns.admins import admin_check
-from ..fns.helper import bash
+from ..fns.batch import LogShipper
 from ..fns.helper import time_formatter as tf
 from ..version import __version__ as pyver
 from ..version import ultroid_version as ult_ver
-from . import SUDO_M, owner_and_sudos
+from . import SUDO_M
+from ._perf import PERF
+from ._router import get_router, literal_prefix
 from ._wrappers import eod
 
 MANAGER = udB.get_key("MANAGER")
@@ -55,6 +59,81 @@ black_list_chats = udB.get_key("BLACKLIST_CHATS")
 allow_sudo = SUDO_M.should_allow_sudo
 
 
+async def _send_command_logs(text):
+    if log_channel := udB.get_key("LOG_CHANNEL"):
+        await asst.send_message(log_channel, text)
+
+
+# COMMAND_LOGGER messages, sent to log channel in batches.
+_command_logs = LogShipper(_send_command_logs)
+
+
+# reported errors, by fingerprint: [report link, new occurrences, command]
+_CRASHES = {}
+_CRASH_SUMMARY_DELAY = 10 * 60
+_crash_summary = None
+
+
+def _fingerprint(name, er):
+    """Same for errors of a command, raised at same place."""
+    frames = extract_tb(er.__traceback__)
+    data = f"{name}|{type(er).__name__}|" + "|".join(
+        f"{frame.filename}:{frame.lineno}" for frame in frames
+    )
+    return hashlib.sha1(data.encode()).hexdigest()
+
+
+def _last_commits():
+    try:
+        result = subprocess.run(
+            'git log --pretty=format:"%an: %s" -5',
+            shell=True,
+            capture_output=True,
+            text=True,
+        )
+    except OSError as er:
+        return str(er)
+    return result.stdout + result.stderr
+
+
+# added to crash reports, read once at startup.
+_COMMITS = _last_commits()
+
+
+def _schedule_crash_summary():
+    global _crash_summary
+    if not _crash_summary or _crash_summary.done():
+        _crash_summary = asyncio.create_task(_send_crash_summary())
+
+
+async def _send_crash_summary():
+    await asyncio.sleep(_CRASH_SUMMARY_DELAY)
+    text = ""
+    for link, count, command in _CRASHES.values():
+        if count:
+            text += f"\n• `{command}` failed {count} more times"
+            text += f", [same as this]({link})." if link else "."
+    for crash in _CRASHES.values():
+        crash[1] = 0
+    if text:
+        text = "**#Ultroid Errors Summary**\n" + text
+        try:
+            if len(text) > 4096:
+                with BytesIO(text.encode()) as file:
+                    file.name = "errors-summary.txt"
+                    await asst.send_file(
+                        udB.get_key("LOG_CHANNEL"),
+                        file,
+                        caption="**#Ultroid Errors Summary**",
+                    )
+            else:
+                await asst.send_message(
+                    udB.get_key("LOG_CHANNEL"), text, link_preview=False
+                )
+        except Exception as er:
+            LOGS.exception(er)
+
+
 def compile_pattern(data, hndlr):
     if data.startswith("^"):
         data = data[1:]
@@ -77,33 +156,25 @@ def ultroid_cmd(
     func = kwargs.get("func", lambda e: not e.via_bot_id)
 
     def decor(dec):
+        name = literal_prefix((pattern or "").lstrip("^").lstrip(".")) or dec.__name__
+
         async def wrapp(ult):
             if udB.get_key("COMMAND_LOGGER"):
-                user_id = ult.sender_id
-                chat_id = ult.chat_id
                 command_name = pattern if pattern else ult.text.split()[0].lstrip(HNDLR)
-                chat_name = get_display_name(ult.chat)
-                LOGS.info(f"Command '{command_name}' executed by user ID {user_id} in chat {chat_id} ({chat_name})")
-                log_channel = udB.get_key("LOG_CHANNEL")
-                if log_channel:
-                    try:
-                        await asst.send_message(
-                            log_channel,
-                            f"Command '{command_name}' executed by user ID {user_id} in chat {chat_id} ({chat_name})"
-                        )
-                    except Exception as e:
-                        LOGS.warning(f"Failed to send command log to log channel {log_channel}: {e}")
+                text = f"Command '{command_name}' executed by user ID {ult.sender_id} in chat {ult.chat_id} ({get_display_name(ult.chat)})"
+                LOGS.info(text)
+                _command_logs.add(text)
             if not ult.out:
                 if owner_only:
                     return
-                if ult.sender_id not in owner_and_sudos():
+                if not SUDO_M.is_owner_or_sudo(ult.sender_id):
                     return
                 if ult.sender_id in _ignore_eval:
                     return await eod(
                         ult,
                         get_string("py_d1"),
                     )
-                if fullsudo and ult.sender_id not in SUDO_M.fullsudos:
+                if fullsudo and not SUDO_M.is_fullsudo(ult.sender_id):
                     return await eod(ult, get_string("py_d2"), time=15)
             chat = ult.chat
             if hasattr(chat, "title"):
@@ -124,18 +195,13 @@ def ultroid_cmd(
                     time=10,
                 )
             try:
-                await dec(ult)
+                await PERF.run(name, dec, ult)
             except FloodWaitError as fwerr:
+                # only requests of this kind in this chat are held back,
+                # by client's request governor.
                 await asst.send_message(
                     udB.get_key("LOG_CHANNEL"),
-                    f"`FloodWaitError:\n{str(fwerr)}\n\nSleeping for {tf((fwerr.seconds + 10)*1000)}`",
-                )
-                await ultroid_bot.disconnect()
-                await asyncio.sleep(fwerr.seconds + 10)
-                await ultroid_bot.connect()
-                await asst.send_message(
-                    udB.get_key("LOG_CHANNEL"),
-                    "`Bot is working again`",
+                    f"`FloodWaitError:\n{str(fwerr)}\n\nSimilar requests in this chat are paused for {tf(fwerr.seconds*1000)}`",
                 )
                 return
             except ChatSendInlineForbiddenError:
@@ -177,6 +243,18 @@ def ultroid_cmd(
                 pass
             except Exception as e:
                 LOGS.exception(e)
+                fingerprint = _fingerprint(name, e)
+                if crash := _CRASHES.get(fingerprint):
+                    # already reported, only counted for next summary.
+                    crash[1] += 1
+                    _schedule_crash_summary()
+                    if ult.out and crash[0]:
+                        await ult.edit(
+                            f"<b><a href={crash[0]}>[An error occurred]</a></b>",
+                            link_preview=False,
+                            parse_mode="html",
+                        )
+                    return
                 date = strftime("%Y-%m-%d %H:%M:%S", gmtime())
                 naam = get_display_name(chat)
                 ftext = "**Ultroid Client Error:** `Forward this to` @UltroidSupportChat\n\n"
@@ -197,11 +275,7 @@ def ultroid_cmd(
                 ftext += str(sys.exc_info()[1])
                 ftext += "`\n\n--------END ULTROID CRASH LOG--------"
                 ftext += "\n\n\n**Last 5 commits:**`\n"
-
-                stdout, stderr = await bash('git log --pretty=format:"%an: %s" -5')
-                result = stdout + (stderr or "")
-
-                ftext += f"{result}`"
+                ftext += f"{_COMMITS}`"
 
                 if len(ftext) > 4096:
                     with BytesIO(ftext.encode()) as file:
@@ -216,6 +290,10 @@ def ultroid_cmd(
                         udB.get_key("LOG_CHANNEL"),
                         ftext,
                     )
+                # only once sent, so that a failed report is tried again.
+                if len(_CRASHES) >= 500:
+                    _CRASHES.pop(next(iter(_CRASHES)))
+                _CRASHES[fingerprint] = [error_log.message_link, 0, name]
                 if ult.out:
                     await ult.edit(
                         f"<b><a href={error_log.message_link}>[An error occurred]</a></b>",
@@ -233,7 +311,7 @@ def ultroid_cmd(
         if _add_new:
             if pattern:
                 cmd = compile_pattern(pattern, SUDO_HNDLR)
-            ultroid_bot.add_event_handler(
+            get_router(ultroid_bot).add(
                 wrapp,
                 NewMessage(
                     pattern=cmd,
@@ -243,10 +321,12 @@ def ultroid_cmd(
                     chats=chats,
                     blacklist_chats=blacklist_chats,
                 ),
+                SUDO_HNDLR,
+                pattern,
             )
         if pattern:
             cmd = compile_pattern(pattern, HNDLR)
-        ultroid_bot.add_event_handler(
+        get_router(ultroid_bot).add(
             wrapp,
             NewMessage(
                 outgoing=True if _add_new else None,
@@ -256,13 +336,15 @@ def ultroid_cmd(
                 chats=chats,
                 blacklist_chats=blacklist_chats,
             ),
+            HNDLR,
+            pattern,
         )
         if TAKE_EDITS:
 
             def func_(x):
                 return not x.via_bot_id and not (x.is_channel and x.chat.broadcast)
 
-            ultroid_bot.add_event_handler(
+            get_router(ultroid_bot, MessageEdited).add(
                 wrapp,
                 MessageEdited(
                     pattern=cmd,
@@ -271,6 +353,8 @@ def ultroid_cmd(
                     chats=chats,
                     blacklist_chats=blacklist_chats,
                 ),
+                HNDLR,
+                pattern,
             )
         if manager and MANAGER:
             allow_all = kwargs.get("allow_all", False)
@@ -283,7 +367,7 @@ def ultroid_cmd(
                 if not allow_pm and ult.is_private:
                     return
                 try:
-                    await dec(ult)
+                    await PERF.run(f"/{name}", dec, ult)
                 except Exception as er:
                     if chat := udB.get_key("MANAGER_LOG"):
                         text = f"**#MANAGER_LOG\n\nChat:** `{get_display_name(ult.chat)}` `{ult.chat_id}`"
@@ -299,7 +383,7 @@ def ultroid_cmd(
 
             if pattern:
                 cmd = compile_pattern(pattern, "/")
-            asst.add_event_handler(
+            get_router(asst).add(
                 manager_cmd,
                 NewMessage(
                     pattern=cmd,
@@ -309,11 +393,13 @@ def ultroid_cmd(
                     chats=chats,
                     blacklist_chats=blacklist_chats,
                 ),
+                "/",
+                pattern,
             )
         if DUAL_MODE and not (manager and DUAL_HNDLR == "/"):
             if pattern:
                 cmd = compile_pattern(pattern, DUAL_HNDLR)
-            asst.add_event_handler(
+            get_router(asst).add(
                 wrapp,
                 NewMessage(
                     pattern=cmd,
@@ -323,8 +409,10 @@ def ultroid_cmd(
                     chats=chats,
                     blacklist_chats=blacklist_chats,
                 ),
+                DUAL_HNDLR,
+                pattern,
             )
-        file = Path(inspect.stack()[1].filename)
+        file = Path(kwargs.get("file") or inspect.stack()[1].filename)
         if "addons/" in str(file):
             if LOADED.get(file.stem):
                 LOADED[file.stem].append(wrapp)
@@ -335,6 +423,7 @@ def ultroid_cmd(
                 LIST[file.stem].append(pattern)
             else:
                 LIST.update({file.stem: [pattern]})
+        wrapp.__wrapped__ = dec
         return wrapp
 
     return decor
@@ -0,0 +1,260 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""Lazy loading of plugins, with 'LAZY_PLUGINS' enabled.
+
+Plugins are scanned (without importing them) for their 'ultroid_cmd'
+commands, and the result is kept in a manifest, rescanned only for changed
+files. Plugins, which do nothing else at import than defining commands,
+are registered with stubs from manifest, and imported on first use of any
+of their commands. Rest are imported as usual."""
+
+import ast
+import inspect
+import json
+import os
+import sys
+from importlib import import_module
+from types import SimpleNamespace
+
+from .. import LOGS
+from ..dB._core import LIST
+from ._decorators import ultroid_cmd
+from ._router import find_routes, remove_routes
+
+MANIFEST = "resources/plugin_manifest.json"
+# changed along with format of manifest entries, to rescan plugins.
+_FORMAT = 2
+
+# module name -> stub commands, till it's imported.
+_STUBS = {}
+# module name -> (plugin path, manifest entry), to register stubs again.
+_ENTRIES = {}
+
+_SAFE_STATEMENTS = (
+    ast.Import,
+    ast.ImportFrom,
+    ast.Assign,
+    ast.AnnAssign,
+    ast.ClassDef,
+    ast.Pass,
+)
+
+
+# calls, which start something at import (and so need the plugin imported).
+_SIDE_EFFECTS = {
+    "add_event_handler",
+    "add_handler",
+    "add_job",
+    "create_task",
+    "ensure_future",
+    "run_in_loop",
+    "start",
+    "watch",
+}
+
+
+def _has_side_effects(node):
+    for child in ast.walk(node):
+        if isinstance(child, ast.ClassDef) and child.decorator_list:
+            return True
+        if isinstance(child, ast.Call):
+            func = child.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+            if name in _SIDE_EFFECTS:
+                return True
+    return False
+
+
+def _is_docstring(node):
+    return isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+
+
+def _is_log(node):
+    return (
+        isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Call)
+        and isinstance(node.value.func, ast.Attribute)
+        and getattr(node.value.func.value, "id", None) == "LOGS"
+    )
+
+
+def _commands(node):
+    """Commands of a function, or None if it has other decorators."""
+    commands = []
+    for decorator in node.decorator_list:
+        if not (
+            isinstance(decorator, ast.Call)
+            and isinstance(decorator.func, ast.Name)
+            and decorator.func.id == "ultroid_cmd"
+        ):
+            return
+        kwargs = {}
+        try:
+            if decorator.args:
+                kwargs["pattern"] = ast.literal_eval(decorator.args[0])
+            for keyword in decorator.keywords:
+                kwargs[keyword.arg] = ast.literal_eval(keyword.value)
+            json.dumps(kwargs)
+        except (ValueError, TypeError):
+            return
+        # manager commands are handled by another callback.
+        if kwargs.get("manager"):
+            return
+        # same as 'co_firstlineno' of function, names can repeat in a plugin.
+        line = node.decorator_list[0].lineno
+        commands.append({"func": node.name, "line": line, "kwargs": kwargs})
+    return commands
+
+
+def scan(path):
+    """Manifest entry of a plugin file."""
+    with open(path, encoding="utf-8") as file:
+        tree = ast.parse(file.read(), path)
+    entry = {"lazy": False, "doc": ast.get_docstring(tree), "commands": []}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if (commands := _commands(node)) is None:
+                return entry
+            entry["commands"].extend(commands)
+        elif isinstance(node, ast.Try):
+            # optional imports.
+            for child in ast.walk(node):
+                if isinstance(child, ast.stmt) and not (
+                    isinstance(child, (*_SAFE_STATEMENTS, ast.Try, ast.Raise))
+                    or _is_docstring(child)
+                    or _is_log(child)
+                ):
+                    return entry
+        elif not (isinstance(node, _SAFE_STATEMENTS) or _is_docstring(node)):
+            return entry
+        if _has_side_effects(node) and not isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef)
+        ):
+            return entry
+    entry["lazy"] = bool(entry["commands"])
+    return entry
+
+
+class PluginManifest:
+    def __init__(self, path=MANIFEST):
+        self.path = path
+        self._changed = False
+        try:
+            with open(path) as file:
+                self._data = json.load(file)
+        except (OSError, ValueError):
+            self._data = {}
+
+    def get(self, plugin):
+        stat = os.stat(plugin)
+        stamp = [stat.st_mtime, stat.st_size, _FORMAT]
+        entry = self._data.get(plugin)
+        if not entry or entry.get("stamp") != stamp:
+            try:
+                entry = scan(plugin)
+            except (OSError, SyntaxError, ValueError) as er:
+                LOGS.debug(f"Manifest: can't scan {plugin}: {er}")
+                entry = {"lazy": False, "commands": []}
+            entry["stamp"] = stamp
+            self._data[plugin] = entry
+            self._changed = True
+        return entry
+
+    def save(self):
+        if not self._changed:
+            return
+        try:
+            with open(self.path, "w") as file:
+                json.dump(self._data, file)
+            self._changed = False
+        except OSError as er:
+            LOGS.warning(f"Manifest: can't save {self.path}: {er}")
+
+
+def _drop_stubs(name):
+    if stubs := _STUBS.pop(name, None):
+        remove_routes(lambda func: func in stubs)
+
+
+def _import_plugin(name):
+    if name not in _STUBS:
+        return import_module(name)
+    plugin, entry = _ENTRIES[name]
+    stem = name.split(".")[-1]
+    _drop_stubs(name)
+    # added again by real commands.
+    LIST.pop(stem, None)
+    try:
+        return import_module(name)
+    except BaseException:
+        # commands, which got added before failing, are replaced by stubs again.
+        path = os.path.abspath(plugin)
+        remove_routes(lambda callback: _defined_in(callback, path))
+        LIST.pop(stem, None)
+        _register_stubs(name, plugin, entry)
+        raise
+
+
+def _defined_in(callback, path):
+    code = getattr(inspect.unwrap(callback), "__code__", None)
+    return code is not None and os.path.abspath(code.co_filename) == path
+
+
+def _defined_at(callback, path, line):
+    code = getattr(inspect.unwrap(callback), "__code__", None)
+    return (
+        code is not None
+        and code.co_firstlineno == line
+        and os.path.abspath(code.co_filename) == path
+    )
+
+
+def _make_stub(name, plugin, func, line):
+    path = os.path.abspath(plugin)
+
+    async def stub(event):
+        try:
+            _import_plugin(name)
+        except ModuleNotFoundError as er:
+            return LOGS.error(f"{name}: '{er.name}' not installed!")
+        handlers = find_routes(lambda callback: _defined_at(callback, path, line))
+        if not handlers:
+            return LOGS.error(f"{name}: command '{func}' not found after import!")
+        await inspect.unwrap(handlers[0])(event)
+
+    stub.__name__ = func
+    return stub
+
+
+def register_lazy(plugin, manifest):
+    """Register commands of 'plugin' from 'manifest', without importing it.
+    Returns stand-in for module (with its docstring), or None if plugin
+    has to be imported."""
+    name = plugin.replace(".py", "").replace("/", ".").replace("\\", ".")
+    entry = manifest.get(plugin)
+    if not entry["lazy"] or name in sys.modules:
+        return
+    _register_stubs(name, plugin, entry)
+    return SimpleNamespace(__name__=name, __doc__=entry["doc"])
+
+
+def _register_stubs(name, plugin, entry):
+    _ENTRIES[name] = plugin, entry
+    stubs = _STUBS[name] = []
+    for command in entry["commands"]:
+        stub = _make_stub(name, plugin, command["func"], command["line"])
+        stubs.append(ultroid_cmd(file=plugin, **command["kwargs"])(stub))
+
+
+def settle_lazy():
+    """Drop stubs of plugins, which were imported by other plugins."""
+    for name in [_ for _ in _STUBS if _ in sys.modules]:
+        _drop_stubs(name)
+        stem = name.split(".")[-1]
+        if stem in LIST:
+            LIST[stem] = list(dict.fromkeys(LIST[stem]))
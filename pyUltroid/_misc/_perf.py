@@ -0,0 +1,102 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""Timing of command, callback and inline handlers.
+
+Records calls, errors, latency and Telegram requests sent by each handler,
+shown with '.perf' and (if PERF_SUMMARY is set) sent to log channel."""
+
+import time
+from collections import deque
+
+from telethon.events import StopPropagation
+
+from .. import LOGS, udB
+from ..startup.BaseClient import RPC_COUNTER
+
+# latest latencies kept per handler, for percentiles.
+_SAMPLES = 512
+# seconds, after which a handler is logged as slow.
+SLOW_THRESHOLD = 10
+
+
+class _Stats:
+    __slots__ = ("calls", "errors", "rpcs", "total", "latencies")
+
+    def __init__(self):
+        self.calls = self.errors = self.rpcs = 0
+        self.total = 0.0
+        self.latencies = deque(maxlen=_SAMPLES)
+
+    def percentile(self, percent):
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, len(latencies) * percent // 100)]
+
+
+class HandlerStats:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._stats = {}
+        self.since = time.time()
+
+    async def run(self, name, func, event):
+        """Run 'func(event)', recording it under 'name'."""
+        counter = [0]
+        token = RPC_COUNTER.set(counter)
+        start = time.perf_counter()
+        error = False
+        try:
+            return await func(event)
+        except StopPropagation:
+            raise
+        except BaseException:
+            error = True
+            raise
+        finally:
+            RPC_COUNTER.reset(token)
+            self.record(
+                name,
+                time.perf_counter() - start,
+                counter[0],
+                error,
+                getattr(event, "chat_id", None),
+            )
+
+    def record(self, name, seconds, rpcs=0, error=False, chat=None):
+        stats = self._stats.get(name)
+        if not stats:
+            stats = self._stats[name] = _Stats()
+        stats.calls += 1
+        stats.errors += error
+        stats.rpcs += rpcs
+        stats.total += seconds
+        stats.latencies.append(seconds)
+        threshold = udB.get_key("SLOW_THRESHOLD") or SLOW_THRESHOLD
+        if seconds >= float(threshold):
+            LOGS.warning(
+                f"Slow handler '{name}' took {seconds:.2f}s in chat {chat} ({rpcs} requests)"
+            )
+
+    def report(self, limit=15):
+        if not self._stats:
+            return "`No commands were used yet.`"
+        text = f"**Handler stats** (since {time.strftime('%d %b %H:%M', time.localtime(self.since))})\n"
+        ordered = sorted(self._stats.items(), key=lambda _: _[1].total, reverse=True)
+        for name, stats in ordered[:limit]:
+            text += (
+                f"\n• `{name}` - {stats.calls} calls, {stats.errors} errors"
+                f"\n    p50 `{stats.percentile(50):.2f}s` p95 `{stats.percentile(95):.2f}s`"
+                f" p99 `{stats.percentile(99):.2f}s`, {stats.rpcs / stats.calls:.1f} requests/call"
+            )
+        if len(ordered) > limit:
+            text += f"\n\n`and {len(ordered) - limit} more...`"
+        return text
+
+
+PERF = HandlerStats()
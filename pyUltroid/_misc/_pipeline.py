@@ -0,0 +1,131 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""Single handler for new messages, which runs chat features (filters,
+blacklist, antiflood...) only in chats where they are enabled.
+
+Index of 'chat_id -> features' is built from database keys of features,
+and rebuilt when any of those keys change.
+"""
+
+from telethon.events import NewMessage, StopPropagation
+
+from .. import LOGS, udB, ultroid_bot
+
+
+class _Feature:
+    def __init__(self, func, keys, chats, incoming, check):
+        self.func = func
+        self.keys = keys
+        self.chats = chats or self._chats_from_keys
+        self.incoming = incoming
+        self.check = check
+
+    def _chats_from_keys(self):
+        chats = set()
+        for key in self.keys:
+            if isinstance(data := udB.get_key(key), dict):
+                chats.update(data)
+        return chats
+
+    def __repr__(self):
+        return f"<Feature {self.func.__module__}.{self.func.__name__}>"
+
+
+class ChatFeatures:
+    def __init__(self, client):
+        self.client = client
+        self._features = []
+        self._index = {}
+        # features, which are enabled in all chats.
+        self._everywhere = ()
+        self._outdated = True
+        client.add_event_handler(self._dispatch, NewMessage())
+
+    def add(self, func, keys, chats=None, incoming=None, check=None):
+        self._features.append(_Feature(func, keys, chats, incoming, check))
+        for key in keys:
+            udB.watch(key, self._outdate)
+        self._outdated = True
+
+    def remove(self, check):
+        """Remove features, whose handler satisfies 'check'."""
+        self._features = [_ for _ in self._features if not check(_.func)]
+        self._outdated = True
+
+    def _outdate(self, key=None):
+        self._outdated = True
+
+    def _rebuild(self):
+        self._outdated = False
+        index, everywhere = {}, []
+        for feature in self._features:
+            try:
+                chats = feature.chats()
+            except Exception as er:
+                LOGS.exception(er)
+                continue
+            if chats is None:
+                everywhere.append(feature)
+                continue
+            for chat in chats:
+                index.setdefault(chat, []).append(feature)
+        order = {feature: _ for _, feature in enumerate(self._features)}
+        self._index = {
+            chat: tuple(sorted(features + everywhere, key=order.get))
+            for chat, features in index.items()
+        }
+        self._everywhere = tuple(everywhere)
+
+    async def _dispatch(self, event):
+        if self._outdated:
+            self._rebuild()
+        features = self._index.get(event.chat_id, self._everywhere)
+        if not features:
+            return
+        for feature in features:
+            if feature.incoming is not None and event.out == feature.incoming:
+                continue
+            if feature.check and not feature.check(event):
+                continue
+            try:
+                await feature.func(event)
+            except StopPropagation:
+                raise
+            except Exception as er:
+                LOGS.exception(er)
+
+
+_FEATURES = None
+
+
+def chat_feature(keys, chats=None, incoming=None, check=None):
+    """Decorator, to run a handler on new messages of chats, which use it.
+
+    keys: udB keys of feature, stored as 'chat_id -> settings'.
+    chats: function to get chat ids from db instead, None in
+        return value enables feature in all chats.
+    incoming: True/False, to only run on incoming/outgoing messages.
+    check: function, to filter messages further."""
+
+    def decor(func):
+        global _FEATURES
+        if not _FEATURES:
+            _FEATURES = ChatFeatures(ultroid_bot)
+        _FEATURES.add(func, keys, chats, incoming, check)
+        return func
+
+    return decor
+
+
+def remove_chat_features(check):
+    if _FEATURES:
+        _FEATURES.remove(check)
+
+
+def count_chat_features():
+    return len(_FEATURES._features) if _FEATURES else 0
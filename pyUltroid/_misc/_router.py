@@ -0,0 +1,164 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""Single handler per client and event type, for all commands.
+
+Commands are indexed in a trie, by their handler and the literal text
+their pattern starts with (like 'ping' for 'ping( (.*)|$)'). An incoming
+message is only checked against commands, whose literal start it begins
+with, so the cost of dispatch doesn't grow with number of loaded plugins.
+"""
+
+import inspect
+from itertools import count
+
+from telethon.events import NewMessage, StopPropagation
+
+from .. import LOGS
+
+_SPECIAL = set(".^$*+?{}[]\\|()")
+
+# Handlers, in which text isn't prefixed by a character.
+NO_HANDLER = [" ", "NO_HNDLR"]
+
+
+def _has_alternation(pattern):
+    """Whether 'pattern' has a '|' outside of groups."""
+    depth = 0
+    escaped = in_class = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and not depth:
+            return True
+    return False
+
+
+def literal_prefix(pattern):
+    """Text, which every match of 'pattern' has to start with."""
+    if not pattern or _has_alternation(pattern):
+        return ""
+    prefix = ""
+    for char in pattern:
+        if char in _SPECIAL:
+            # last character is optional, with these quantifiers.
+            if char in "*?{":
+                prefix = prefix[:-1]
+            break
+        prefix += char
+    return prefix
+
+
+class CommandRouter:
+    def __init__(self, client, event=NewMessage):
+        self.client = client
+        self._trie = {}
+        self._order = count()
+        client.add_event_handler(self._dispatch, event())
+
+    def add(self, callback, builder, hndlr, pattern=None):
+        if pattern:
+            if pattern.startswith("^"):
+                pattern = pattern[1:]
+            if pattern.startswith("."):
+                pattern = pattern[1:]
+        node = self._trie.setdefault("" if hndlr in NO_HANDLER else hndlr, {})
+        for char in literal_prefix(pattern):
+            node = node.setdefault(char, {})
+        node.setdefault(None, []).append((next(self._order), callback, builder))
+
+    def remove(self, check):
+        """Remove routes, whose callback satisfies 'check'."""
+
+        def _remove(node):
+            for key, value in node.items():
+                if key is None:
+                    value[:] = [route for route in value if not check(route[1])]
+                else:
+                    _remove(value)
+
+        _remove(self._trie)
+
+    def _candidates(self, text):
+        routes = []
+        for hndlr, node in self._trie.items():
+            if not text.startswith(hndlr):
+                continue
+            routes.extend(node.get(None, []))
+            for char in text[len(hndlr) :]:
+                if not (node := node.get(char)):
+                    break
+                routes.extend(node.get(None, []))
+        # keep order, in which commands were added.
+        return sorted(routes, key=lambda route: route[0])
+
+    async def _dispatch(self, event):
+        for _, callback, builder in self._candidates(event.message.message or ""):
+            if not builder.resolved:
+                await builder.resolve(self.client)
+            result = builder.filter(event)
+            if inspect.isawaitable(result):
+                result = await result
+            if not result:
+                continue
+            try:
+                await callback(event)
+            except StopPropagation:
+                raise
+            except Exception as er:
+                LOGS.exception(er)
+
+
+_ROUTERS = {}
+
+
+def get_router(client, event=NewMessage):
+    key = (client, event)
+    if key not in _ROUTERS:
+        _ROUTERS[key] = CommandRouter(client, event)
+    return _ROUTERS[key]
+
+
+def remove_routes(check):
+    """Remove routes of all clients, whose callback satisfies 'check'."""
+    for router in _ROUTERS.values():
+        router.remove(check)
+
+
+def find_routes(check):
+    """Callbacks of all clients' routes, which satisfy 'check'."""
+    found = []
+
+    def _find(node):
+        for key, value in node.items():
+            if key is None:
+                found.extend(route[1] for route in value if check(route[1]))
+            else:
+                _find(value)
+
+    for router in _ROUTERS.values():
+        _find(router._trie)
+    return found
+
+
+def count_routes():
+    def _count(node):
+        return sum(
+            len(value) if key is None else _count(value) for key, value in node.items()
+        )
+
+    return sum(_count(router._trie) for router in _ROUTERS.values())
@@ -51,3 +51,15 @@ class Var:
     DATABASE_URL = config("DATABASE_URL", default=None)
     # for MONGODB users
     MONGO_URI = config("MONGO_URI", default=None)
+    # write-behind flush interval for database (in seconds), 0 to disable
+    DB_WRITE_BEHIND = config("DB_WRITE_BEHIND", default=0, cast=float)
+    # format of values in database: "json" or "repr" (readable by older versions)
+    DB_CODEC = config("DB_CODEC", default="json")
+    # use asyncio database drivers (if installed), for writes from event loop
+    DB_ASYNC = config("DB_ASYNC", default=True, cast=bool)
+    # keep cache in sync with other processes sharing the database (multi_client.py)
+    DB_SYNC = config("DB_SYNC", default=False, cast=bool)
+    # load whole database into cache at startup, with a few bulk reads
+    DB_PREFETCH = config("DB_PREFETCH", default=True, cast=bool)
+    # message link of local database backup, in telegram
+    TGDB_URL = config("TGDB_URL", default=None)
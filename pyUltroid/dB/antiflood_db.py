@@ -14,19 +14,12 @@ def get_flood():
 
 
 def set_flood(chat_id, limit):
-    omk = get_flood()
-    omk.update({chat_id: limit})
-    return udB.set_key("ANTIFLOOD", omk)
+    return udB.hset("ANTIFLOOD", chat_id, limit)
 
 
 def get_flood_limit(chat_id):
-    omk = get_flood()
-    if chat_id in omk.keys():
-        return omk[chat_id]
+    return udB.hget("ANTIFLOOD", chat_id)
 
 
 def rem_flood(chat_id):
-    omk = get_flood()
-    if chat_id in omk.keys():
-        del omk[chat_id]
-        return udB.set_key("ANTIFLOOD", omk)
+    return udB.hdel("ANTIFLOOD", chat_id)
@@ -5,6 +5,9 @@ class KeyManager:
     def __init__(self, key, cast=None) -> None:
         self._key = key
         self._cast = cast
+        # set of items for 'contains', rebuilt when key is changed in udB.
+        self._index = None
+        self._version = None
 
     def get(self):
         _data = udB.get_key(self._key)
@@ -19,26 +22,52 @@ class KeyManager:
         return len(self.get())
 
     def add(self, item):
+        return self.add_many([item])
+
+    def add_many(self, items):
+        """Add all 'items', with a single write."""
         content = self.get()
-        if content == None and callable(type(item)):
-            content = type(item)()
-        if isinstance(content, dict) and isinstance(item, dict):
-            content.update(item)
-        elif isinstance(content, list) and item not in content:
-            content.append(item)
-        else:
-            return
-        udB.set_key(self._key, content)
+        changed = False
+        for item in items:
+            if content == None and callable(type(item)):
+                content = type(item)()
+            if isinstance(content, dict) and isinstance(item, dict):
+                content.update(item)
+            elif isinstance(content, list) and item not in content:
+                content.append(item)
+            else:
+                continue
+            changed = True
+        if changed:
+            udB.set_key(self._key, content)
 
     def remove(self, item):
+        return self.remove_many([item])
+
+    def remove_many(self, items):
+        """Remove all 'items', with a single write."""
         content = self.get()
-        if isinstance(content, list) and item in content:
-            content.remove(item)
-        elif isinstance(content, dict) and content.get(item):
-            del content[item]
-        else:
-            return
-        udB.set_key(self._key, content)
+        changed = False
+        for item in items:
+            if isinstance(content, list) and item in content:
+                content.remove(item)
+            elif isinstance(content, dict) and content.get(item):
+                del content[item]
+            else:
+                continue
+            changed = True
+        if changed:
+            udB.set_key(self._key, content)
 
     def contains(self, item):
-        return item in self.get()
+        version = udB.version(self._key)
+        if version != self._version:
+            content = self._index = self.get()
+            if isinstance(content, (list, tuple, set)):
+                try:
+                    self._index = frozenset(content)
+                except TypeError:
+                    # unhashable items, checked against list.
+                    pass
+            self._version = version
+        return item in self._index
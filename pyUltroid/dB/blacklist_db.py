@@ -6,6 +6,11 @@
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
 from .. import udB
+from ..fns.matcher import BlacklistMatcher
+
+# chat -> compiled blacklist, dropped when blacklists are changed.
+_MATCHERS = {}
+udB.watch("BLACKLIST_DB", lambda key: _MATCHERS.clear())
 
 
 def get_stuff():
@@ -13,21 +18,18 @@ def get_stuff():
 
 
 def add_blacklist(chat, word):
-    ok = get_stuff()
-    if ok.get(chat):
-        for z in word.split():
-            if z not in ok[chat]:
-                ok[chat].append(z)
-    else:
-        ok.update({chat: [word]})
-    return udB.set_key("BLACKLIST_DB", ok)
+    """Add word, phrase or wildcard (like 'spam*') to blacklist of chat."""
+    ok = get_blacklist(chat) or []
+    if word not in ok:
+        ok.append(word)
+    return udB.hset("BLACKLIST_DB", chat, ok)
 
 
 def rem_blacklist(chat, word):
-    ok = get_stuff()
-    if ok.get(chat) and word in ok[chat]:
-        ok[chat].remove(word)
-        return udB.set_key("BLACKLIST_DB", ok)
+    ok = get_blacklist(chat)
+    if ok and word in ok:
+        ok.remove(word)
+        return udB.hset("BLACKLIST_DB", chat, ok)
 
 
 def list_blacklist(chat):
@@ -39,6 +41,10 @@ def list_blacklist(chat):
 
 
 def get_blacklist(chat):
-    ok = get_stuff()
-    if ok.get(chat):
-        return ok[chat]
+    return udB.hget("BLACKLIST_DB", chat)
+
+
+def get_blacklist_matcher(chat):
+    if chat not in _MATCHERS:
+        _MATCHERS[chat] = BlacklistMatcher(get_blacklist(chat) or [])
+    return _MATCHERS[chat]
@@ -8,33 +8,33 @@
 
 from .. import udB
 
+# Tags are only needed for replying to recent mentions.
+udB.set_limit("BOTCHAT_TAG", max_fields=1000, ttl=7 * 24 * 60 * 60)
+
 
 def get_stuff():
     return udB.get_key("BOTCHAT") or {}
 
 
 def add_stuff(msg_id, user_id):
-    ok = get_stuff()
-    ok.update({msg_id: user_id})
-    return udB.set_key("BOTCHAT", ok)
+    return udB.hset("BOTCHAT", msg_id, user_id)
 
 
 def get_who(msg_id):
-    ok = get_stuff()
-    if ok.get(msg_id):
-        return ok[msg_id]
+    return udB.hget("BOTCHAT", msg_id)
+
+
+# Tags are kept in their own key, so that each one is a single field write.
+# Older ones are still read from "TAG" in "BOTCHAT".
 
 
 def tag_add(msg, chat, user):
-    ok = get_stuff()
-    if not ok.get("TAG"):
-        ok.update({"TAG": {msg: [chat, user]}})
-    else:
-        ok["TAG"].update({msg: [chat, user]})
-    return udB.set_key("BOTCHAT", ok)
+    return udB.hset("BOTCHAT_TAG", msg, [chat, user])
 
 
 def who_tag(msg):
+    if tag := udB.hget("BOTCHAT_TAG", msg):
+        return tag
     ok = get_stuff()
     if ok.get("TAG") and ok["TAG"].get(msg):
         return ok["TAG"][msg]
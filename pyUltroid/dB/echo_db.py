@@ -13,31 +13,25 @@ def get_stuff():
 
 
 def add_echo(chat, user):
-    x = get_stuff()
-    if k := x.get(int(chat)):
+    if k := list_echo(chat):
         if user not in k:
             k.append(int(user))
-        x.update({int(chat): k})
     else:
-        x.update({int(chat): [int(user)]})
-    return udB.set_key("ECHO", x)
+        k = [int(user)]
+    return udB.hset("ECHO", int(chat), k)
 
 
 def rem_echo(chat, user):
-    x = get_stuff()
-    if k := x.get(int(chat)):
+    if k := list_echo(chat):
         if user in k:
             k.remove(int(user))
-        x.update({int(chat): k})
-    return udB.set_key("ECHO", x)
+        return udB.hset("ECHO", int(chat), k)
 
 
 def check_echo(chat, user):
-    x = get_stuff()
-    if (k := x.get(int(chat))) and int(user) in k:
+    if (k := list_echo(chat)) and int(user) in k:
         return True
 
 
 def list_echo(chat):
-    x = get_stuff()
-    return x.get(int(chat))
+    return udB.hget("ECHO", int(chat))
@@ -7,29 +7,25 @@
 
 from .. import udB
 
+# Least recently used links are dropped, beyond this.
+udB.set_limit("FILE_STORE", max_fields=10000)
+
 
 def get_stored():
     return udB.get_key("FILE_STORE") or {}
 
 
 def store_msg(hash, msg_id):
-    all = get_stored()
-    all.update({hash: msg_id})
-    return udB.set_key("FILE_STORE", all)
+    return udB.hset("FILE_STORE", hash, msg_id)
 
 
 def list_all_stored_msgs():
-    all = get_stored()
-    return list(all.keys())
+    return udB.hkeys("FILE_STORE")
 
 
 def get_stored_msg(hash):
-    all = get_stored()
-    if all.get(hash):
-        return all[hash]
+    return udB.hget("FILE_STORE", hash)
 
 
 def del_stored(hash):
-    all = get_stored()
-    all.pop(hash)
-    return udB.set_key("FILE_STORE", all)
+    return udB.hdel("FILE_STORE", hash)
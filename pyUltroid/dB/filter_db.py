@@ -6,6 +6,11 @@
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
 from .. import udB
+from ..fns.matcher import WordMatcher
+
+# chat -> matcher of its filter words, dropped when filters are changed.
+_MATCHERS = {}
+udB.watch("FILTERS", lambda key: _MATCHERS.clear())
 
 
 def get_stuff():
@@ -13,32 +18,31 @@ def get_stuff():
 
 
 def add_filter(chat, word, msg, media, button):
-    ok = get_stuff()
-    if ok.get(chat):
-        ok[chat].update({word: {"msg": msg, "media": media, "button": button}})
-    else:
-        ok.update({chat: {word: {"msg": msg, "media": media, "button": button}}})
-    udB.set_key("FILTERS", ok)
+    ok = get_filter(chat) or {}
+    ok.update({word: {"msg": msg, "media": media, "button": button}})
+    udB.hset("FILTERS", chat, ok)
 
 
 def rem_filter(chat, word):
-    ok = get_stuff()
-    if ok.get(chat) and ok[chat].get(word):
-        ok[chat].pop(word)
-        udB.set_key("FILTERS", ok)
+    ok = get_filter(chat)
+    if ok and ok.get(word):
+        ok.pop(word)
+        udB.hset("FILTERS", chat, ok)
 
 
 def rem_all_filter(chat):
-    ok = get_stuff()
-    if ok.get(chat):
-        ok.pop(chat)
-        udB.set_key("FILTERS", ok)
+    if get_filter(chat):
+        udB.hdel("FILTERS", chat)
 
 
 def get_filter(chat):
-    ok = get_stuff()
-    if ok.get(chat):
-        return ok[chat]
+    return udB.hget("FILTERS", chat)
+
+
+def get_filter_matcher(chat):
+    if chat not in _MATCHERS:
+        _MATCHERS[chat] = WordMatcher(get_filter(chat) or {})
+    return _MATCHERS[chat]
 
 
 def list_filter(chat):
@@ -13,22 +13,22 @@ def get_muted():
 
 
 def mute(chat, id):
-    ok = get_muted()
-    if ok.get(chat):
-        if id not in ok[chat]:
-            ok[chat].append(id)
+    ok = udB.hget("MUTE", chat)
+    if ok:
+        if id not in ok:
+            ok.append(id)
     else:
-        ok.update({chat: [id]})
-    return udB.set_key("MUTE", ok)
+        ok = [id]
+    return udB.hset("MUTE", chat, ok)
 
 
 def unmute(chat, id):
-    ok = get_muted()
-    if ok.get(chat) and id in ok[chat]:
-        ok[chat].remove(id)
-    return udB.set_key("MUTE", ok)
+    ok = udB.hget("MUTE", chat)
+    if ok and id in ok:
+        ok.remove(id)
+        return udB.hset("MUTE", chat, ok)
 
 
 def is_muted(chat, id):
-    ok = get_muted()
-    return bool(ok.get(chat) and id in ok[chat])
+    ok = udB.hget("MUTE", chat)
+    return bool(ok and id in ok)
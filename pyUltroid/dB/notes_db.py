@@ -13,35 +13,29 @@ def get_stuff():
 
 
 def add_note(chat, word, msg, media, button):
-    ok = get_stuff()
-    if ok.get(int(chat)):
-        ok[int(chat)].update({word: {"msg": msg, "media": media, "button": button}})
-    else:
-        ok.update({int(chat): {word: {"msg": msg, "media": media, "button": button}}})
-    udB.set_key("NOTE", ok)
+    ok = udB.hget("NOTE", int(chat)) or {}
+    ok.update({word: {"msg": msg, "media": media, "button": button}})
+    udB.hset("NOTE", int(chat), ok)
 
 
 def rem_note(chat, word):
-    ok = get_stuff()
-    if ok.get(int(chat)) and ok[int(chat)].get(word):
-        ok[int(chat)].pop(word)
-        return udB.set_key("NOTE", ok)
+    ok = udB.hget("NOTE", int(chat))
+    if ok and ok.get(word):
+        ok.pop(word)
+        return udB.hset("NOTE", int(chat), ok)
 
 
 def rem_all_note(chat):
-    ok = get_stuff()
-    if ok.get(int(chat)):
-        ok.pop(int(chat))
-        return udB.set_key("NOTE", ok)
+    if udB.hget("NOTE", int(chat)):
+        return udB.hdel("NOTE", int(chat))
 
 
 def get_notes(chat, word):
-    ok = get_stuff()
-    if ok.get(int(chat)) and ok[int(chat)].get(word):
-        return ok[int(chat)][word]
+    ok = udB.hget("NOTE", int(chat))
+    if ok and ok.get(word):
+        return ok[word]
 
 
 def list_note(chat):
-    ok = get_stuff()
-    if ok.get(int(chat)):
-        return "".join(f"👉 #{z}\n" for z in ok[chat])
+    if ok := udB.hget("NOTE", int(chat)):
+        return "".join(f"👉 #{z}\n" for z in ok)
@@ -13,23 +13,16 @@ def get_all_snips():
 
 
 def add_snip(word, msg, media, button):
-    ok = get_all_snips()
-    ok.update({word: {"msg": msg, "media": media, "button": button}})
-    udB.set_key("SNIP", ok)
+    udB.hset("SNIP", word, {"msg": msg, "media": media, "button": button})
 
 
 def rem_snip(word):
-    ok = get_all_snips()
-    if ok.get(word):
-        ok.pop(word)
-        udB.set_key("SNIP", ok)
+    if udB.hget("SNIP", word):
+        udB.hdel("SNIP", word)
 
 
 def get_snips(word):
-    ok = get_all_snips()
-    if ok.get(word):
-        return ok[word]
-    return False
+    return udB.hget("SNIP", word) or False
 
 
 def list_snip():
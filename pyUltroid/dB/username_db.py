@@ -0,0 +1,19 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+from .. import udB
+
+# Users, whose username wasn't looked up for long, are forgotten.
+udB.set_limit("USERNAME_DB", max_fields=20000, ttl=90 * 24 * 60 * 60)
+
+
+async def get_username(user_id):
+    return await udB.ahget("USERNAME_DB", user_id)
+
+
+async def set_username(user_id, username):
+    return await udB.ahset("USERNAME_DB", user_id, username)
@@ -13,27 +13,24 @@ def get_stuff():
 
 
 def add_warn(chat, user, count, reason):
-    x = get_stuff()
-    try:
-        x[chat].update({user: [count, reason]})
-    except BaseException:
-        x.update({chat: {user: [count, reason]}})
-    return udB.set_key("WARNS", x)
+    x = udB.hget("WARNS", chat) or {}
+    x.update({user: [count, reason]})
+    return udB.hset("WARNS", chat, x)
 
 
 def warns(chat, user):
-    x = get_stuff()
+    x = udB.hget("WARNS", chat) or {}
     try:
-        count, reason = x[chat][user][0], x[chat][user][1]
+        count, reason = x[user][0], x[user][1]
         return count, reason
     except BaseException:
         return 0, None
 
 
 def reset_warn(chat, user):
-    x = get_stuff()
+    x = udB.hget("WARNS", chat)
     try:
-        x[chat].pop(user)
-        return udB.set_key("WARNS", x)
+        x.pop(user)
+        return udB.hset("WARNS", chat, x)
     except BaseException:
         return
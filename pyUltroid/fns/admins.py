@@ -80,7 +80,7 @@ async def get_update_linked_chat(event):
 
 
 async def admin_check(event, require=None, silent: bool = False):
-    if SUDO_M and event.sender_id in SUDO_M.owner_and_sudos():
+    if SUDO_M and SUDO_M.is_owner_or_sudo(event.sender_id):
         return True
     callback = None
 
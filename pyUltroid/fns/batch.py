@@ -0,0 +1,107 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+import asyncio
+from collections import deque
+
+from telethon.errors import FloodWaitError
+
+from .. import LOGS
+
+
+class BatchQueue:
+    """Collects items per key (like chat id), and passes them together to
+    'callback(key, items)', 'delay' seconds after the first one was added,
+    or as soon as 'size' items are queued."""
+
+    def __init__(self, callback, delay=1, size=100):
+        self.callback = callback
+        self.delay = delay
+        self.size = size
+        self._items = {}
+        self._tasks = {}
+
+    def add(self, key, item):
+        items = self._items.setdefault(key, [])
+        if item in items:
+            return
+        items.append(item)
+        if len(items) >= self.size:
+            if task := self._tasks.pop(key, None):
+                task.cancel()
+            self._tasks[key] = asyncio.create_task(self._wait(key, 0))
+        elif key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._wait(key, self.delay))
+
+    async def _wait(self, key, delay):
+        await asyncio.sleep(delay)
+        self._tasks.pop(key, None)
+        await self._flush(key)
+
+    async def _flush(self, key):
+        if not (items := self._items.pop(key, None)):
+            return
+        try:
+            await self.callback(key, items)
+        except Exception as er:
+            LOGS.exception(er)
+
+
+class LogShipper:
+    """Queues lines of text, and passes them joined to 'send(text)' every
+    'interval' seconds, or as soon as 'size' lines are queued.
+
+    A single send runs at a time. If lines pile up beyond 'maxlen' in the
+    meantime (like on FloodWait), oldest ones are dropped and counted."""
+
+    def __init__(self, send, interval=10, size=20, maxlen=200):
+        self.send = send
+        self.interval = interval
+        self.size = size
+        self._lines = deque(maxlen=maxlen)
+        self._dropped = 0
+        self._full = asyncio.Event()
+        self._task = None
+
+    def add(self, line):
+        if len(self._lines) == self._lines.maxlen:
+            self._dropped += 1
+        self._lines.append(line)
+        if not self._task or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        elif len(self._lines) >= self.size:
+            self._full.set()
+
+    async def _run(self):
+        while self._lines:
+            if len(self._lines) < self.size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+            lines = [
+                self._lines.popleft() for _ in range(min(self.size, len(self._lines)))
+            ]
+            dropped, self._dropped = self._dropped, 0
+            text = "\n".join(lines)
+            if dropped:
+                text += f"\n...and {dropped} more, which were dropped."
+            try:
+                await self.send(text)
+            except FloodWaitError as er:
+                self._requeue(lines, dropped)
+                await asyncio.sleep(er.seconds)
+            except Exception as er:
+                LOGS.warning(f"LogShipper: {er}")
+
+    def _requeue(self, lines, dropped):
+        """Put back 'lines', which couldn't be sent, ahead of queued ones.
+        Newest lines make room for them, and are counted as dropped."""
+        overflow = max(0, len(self._lines) + len(lines) - self._lines.maxlen)
+        self._dropped += dropped + overflow
+        self._lines.extendleft(reversed(lines))
@@ -98,9 +98,14 @@ def inline_mention(user, custom=None, html=False):
 
 def un_plug(shortname):
     from .. import asst, ultroid_bot
+    from .._misc._pipeline import remove_chat_features
+    from .._misc._router import remove_routes
 
+    remove_chat_features(lambda func: func.__module__ == f"addons.{shortname}")
     try:
         all_func = LOADED[shortname]
+        # commands are dispatched by router, instead of own handlers.
+        remove_routes(lambda func: func in all_func)
         for client in [ultroid_bot, asst]:
             for x, _ in client.list_event_handlers():
                 if x in all_func:
@@ -530,6 +535,9 @@ async def progress(current, total, event, start, type_of_ps, file_name=None):
 
 
 async def restart(ult=None):
+    from .. import udB
+
+    udB.flush()
     if len(sys.argv) == 1:
         os.execl(sys.executable, sys.executable, "-m", "pyUltroid")
     else:
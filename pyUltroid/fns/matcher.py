@@ -0,0 +1,140 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""Matching many words against a text, in a single pass."""
+
+import re
+import unicodedata
+from collections import deque
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class WordMatcher:
+    """Finds which of 'words' occur in a text, in time linear to the text.
+
+    Built once for a set of words, and reused for every text."""
+
+    def __init__(self, words):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for word in words:
+            if word:
+                self._add(word)
+        self._link()
+
+    def __bool__(self):
+        return len(self._goto) > 1
+
+    def _add(self, word):
+        node = 0
+        for char in word:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[node][char] = nxt
+            node = nxt
+        self._out[node] += (word,)
+
+    def _link(self):
+        # breadth first, so that fail links of shorter prefixes are ready.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def iter(self, text):
+        """Yield (start, end, word) for every occurrence of words in 'text'."""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for word in out[node]:
+                yield index + 1 - len(word), index + 1, word
+
+    def find(self, text, whole_words=True):
+        """Set of words found in 'text'.
+        With 'whole_words', a match should not be surrounded by letters or digits."""
+        found = set()
+        for start, end, word in self.iter(text):
+            if word in found:
+                continue
+            if whole_words and (
+                (start and _is_word_char(text[start - 1]))
+                or (end < len(text) and _is_word_char(text[end]))
+            ):
+                continue
+            found.add(word)
+        return found
+
+
+# ------------------------------ blacklist ------------------------------ #
+
+# Letters of other scripts, which look same as latin ones.
+_HOMOGLYPHS = {
+    **dict(zip("аеорсухіјѕԁһӏԛԝмк", "aeopcyxijsdhlqwmk")),
+    **dict(zip("αεορτυνικχ", "aeoptuvikx")),
+    # invisible characters, used to split words.
+    **dict.fromkeys(["\u00ad", "\u200b", "\u200c", "\u200d", "\u2060", "\ufeff"]),
+}
+_HOMOGLYPHS = str.maketrans(_HOMOGLYPHS)
+
+
+def normalize(text):
+    """Lowercase 'text', with accents, styled letters (like 𝐛𝐨𝐥𝐝 or ｆｕｌｌ
+    width) and lookalike letters of other scripts turned into plain ones."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return text.casefold().translate(_HOMOGLYPHS)
+
+
+class BlacklistMatcher:
+    """Checks text against blacklist entries of a chat.
+
+    Entries can be single words (set lookup), phrases (automaton) or
+    wildcards like 'spam*' (one compiled regex)."""
+
+    def __init__(self, entries):
+        self._words = set()
+        phrases, wildcards = [], []
+        for entry in entries:
+            entry = normalize(entry)
+            if "*" in entry:
+                wildcards.append(re.escape(entry).replace(r"\*", r"\w*"))
+            elif len(entry.split()) > 1:
+                phrases.append(" ".join(entry.split()))
+            elif entry:
+                self._words.add(entry)
+        self._phrases = WordMatcher(phrases)
+        self._wildcard = None
+        if wildcards:
+            self._wildcard = re.compile(
+                r"(?<!\w)(?:" + "|".join(wildcards) + r")(?!\w)"
+            )
+
+    def search(self, text):
+        text = normalize(text)
+        words = text.split()
+        if self._words and not self._words.isdisjoint(words):
+            return True
+        if self._phrases and self._phrases.find(" ".join(words)):
+            return True
+        return bool(self._wildcard and self._wildcard.search(text))
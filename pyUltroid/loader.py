@@ -13,6 +13,7 @@ from logging import Logger
 
 from . import LOGS
 from .fns.tools import get_all_files
+from .startup._profiler import BOOT
 
 
 class Loader:
@@ -29,6 +30,7 @@ class Loader:
         exclude=None,
         after_load=None,
         load_all=False,
+        lazy=None,
     ):
         _single = os.path.isfile(self.path)
         if include:
@@ -56,22 +58,28 @@ class Loader:
                 f"• Installing {self.key} Plugins || Count : {len(files)} •"
             )
         for plugin in sorted(files):
-            if func == import_module:
-                plugin = plugin.replace(".py", "").replace("/", ".").replace("\\", ".")
-            try:
-                modl = func(plugin)
-            except ModuleNotFoundError as er:
-                modl = None
-                self._logger.error(f"{plugin}: '{er.name}' not installed!")
-                continue
-            except Exception as exc:
-                modl = None
-                self._logger.error(f"pyUltroid - {self.key} - ERROR - {plugin}")
-                self._logger.exception(exc)
-                continue
-            if _single and log:
-                self._logger.info(f"Successfully Loaded {plugin}!")
-            if callable(after_load):
+            with BOOT.measure(os.path.basename(plugin).replace(".py", ""), self.key):
+                # registered without importing, see _misc/_lazy.py
+                if lazy and (modl := lazy(plugin)):
+                    if callable(after_load):
+                        after_load(self, modl, plugin_name=modl.__name__.split(".")[-1])
+                    continue
                 if func == import_module:
-                    plugin = plugin.split(".")[-1]
-                after_load(self, modl, plugin_name=plugin)
+                    plugin = plugin.replace(".py", "").replace("/", ".").replace("\\", ".")
+                try:
+                    modl = func(plugin)
+                except ModuleNotFoundError as er:
+                    modl = None
+                    self._logger.error(f"{plugin}: '{er.name}' not installed!")
+                    continue
+                except Exception as exc:
+                    modl = None
+                    self._logger.error(f"pyUltroid - {self.key} - ERROR - {plugin}")
+                    self._logger.exception(exc)
+                    continue
+                if _single and log:
+                    self._logger.info(f"Successfully Loaded {plugin}!")
+                if callable(after_load):
+                    if func == import_module:
+                        plugin = plugin.split(".")[-1]
+                    after_load(self, modl, plugin_name=plugin)
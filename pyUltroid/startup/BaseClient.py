@@ -9,10 +9,12 @@ import contextlib
 import inspect
 import sys
 import time
+from contextvars import ContextVar
 from logging import Logger
 
 from telethonpatch import TelegramClient
 from telethon import utils as telethon_utils
+from telethon.utils import is_list_like
 from telethon.errors import (
     AccessTokenExpiredError,
     AccessTokenInvalidError,
@@ -22,6 +24,10 @@ from telethon.errors import (
 
 from ..configs import Var
 from . import *
+from ._governor import RequestGovernor
+
+# while a handler is timed, holds count of requests sent by it.
+RPC_COUNTER = ContextVar("RPC_COUNTER", default=None)
 
 
 class UltroidClient(TelegramClient):
@@ -48,9 +54,34 @@ class UltroidClient(TelegramClient):
         kwargs["api_hash"] = api_hash or Var.API_HASH
         kwargs["base_logger"] = TelethonLogger
         super().__init__(session, **kwargs)
+        # FloodWaits of all requests (including telethon's internal ones, like
+        # file transfers) are handled by governor, instead of telethon's sleep.
+        self._governor = RequestGovernor(
+            self.flood_sleep_threshold, on_flood=self._on_flood
+        )
+        self.flood_sleep_threshold = 0
         self.run_in_loop(self.start_client(bot_token=bot_token))
         self.dc_id = self.session.dc_id
 
+    def __call__(self, request, *args, **kwargs):
+        if (counter := RPC_COUNTER.get()) is not None:
+            counter[0] += 1
+        return super().__call__(request, *args, **kwargs)
+
+    async def _call(self, sender, request, ordered=False, flood_sleep_threshold=None):
+        # every request goes through here, '__call__' and internal ones.
+        return await self._governor.call(
+            super()._call, request, ordered=ordered, sender=sender
+        )
+
+    def _on_flood(self, request, per_chat):
+        # governor paces per-chat requests by chat, so telethon shouldn't
+        # hold back that type of request in every chat.
+        if per_chat:
+            if is_list_like(request):
+                request = request[0]
+            self._flood_waited_requests.pop(request.CONSTRUCTOR_ID, None)
+
     def __repr__(self):
         return f"<Ultroid.Client :\n self: {self.full_name}\n bot: {self._bot}\n>"
 
@@ -0,0 +1,155 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""Serialization of values stored in database.
+
+Values are written with a versioned prefix (like 'ult:j1:'), which tells
+the codec to read them with. Values without a prefix are treated as the
+legacy format, i.e 'str()' of value read back with 'ast.literal_eval'.
+"""
+
+import ast
+import json
+from base64 import b64decode, b64encode
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ReprCodec:
+    """Legacy format, which older versions of Ultroid can read."""
+
+    name = "repr"
+    prefix = ""
+
+    def encode(self, value):
+        return str(value)
+
+    def decode(self, data):
+        try:
+            return ast.literal_eval(data)
+        except BaseException:
+            return data
+
+
+# JSON has no int keys, tuples, sets or dates.
+# Such values are stored as single key objects, tagged with their type.
+
+_PACK = {
+    tuple: lambda value: {"__t": [_pack(_) for _ in value]},
+    set: lambda value: {"__s": [_pack(_) for _ in value]},
+    frozenset: lambda value: {"__s": [_pack(_) for _ in value]},
+    datetime: lambda value: {"__dt": value.isoformat()},
+    date: lambda value: {"__da": value.isoformat()},
+    bytes: lambda value: {"__b": b64encode(value).decode()},
+}
+
+_UNPACK = {
+    "__d": lambda data: {_unpack(key): _unpack(value) for key, value in data},
+    "__t": lambda data: tuple(_unpack(_) for _ in data),
+    "__s": lambda data: {_unpack(_) for _ in data},
+    "__dt": datetime.fromisoformat,
+    "__da": date.fromisoformat,
+    "__b": b64decode,
+}
+
+_NATIVE = (str, int, float, bool, type(None))
+
+
+def _pack(value):
+    cls = type(value)
+    if cls in _NATIVE:
+        return value
+    if cls is list:
+        return [_pack(_) for _ in value]
+    if cls is dict:
+        if all(type(key) is str for key in value) and not (
+            len(value) == 1 and next(iter(value)) in _UNPACK
+        ):
+            return {key: _pack(_) for key, _ in value.items()}
+        return {"__d": [[_pack(key), _pack(_)] for key, _ in value.items()]}
+    if cls in _PACK:
+        return _PACK[cls](value)
+    raise TypeError(f"Can't serialize {cls.__name__}")
+
+
+def _unpack(value):
+    cls = type(value)
+    if cls is list:
+        return [_unpack(_) for _ in value]
+    if cls is dict:
+        if len(value) == 1:
+            ((tag, data),) = value.items()
+            if tag in _UNPACK:
+                return _UNPACK[tag](data)
+        return {key: _unpack(_) for key, _ in value.items()}
+    return value
+
+
+class JSONCodec:
+    """JSON with type tags, uses 'orjson' if installed."""
+
+    name = "json"
+    prefix = "ult:j1:"
+
+    if orjson:
+
+        @staticmethod
+        def _dumps(value):
+            return orjson.dumps(value).decode()
+
+        _loads = staticmethod(orjson.loads)
+    else:
+
+        @staticmethod
+        def _dumps(value):
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+        _loads = staticmethod(json.loads)
+
+    def encode(self, value):
+        return self.prefix + self._dumps(_pack(value))
+
+    def decode(self, data):
+        value = self._loads(data)
+        # Skip walking the value, when nothing is tagged.
+        if '"__' not in data:
+            return value
+        return _unpack(value)
+
+
+_LEGACY = ReprCodec()
+CODECS = {_.name: _ for _ in [_LEGACY, JSONCodec()]}
+
+
+def get_codec(name):
+    return CODECS.get(name) or CODECS["json"]
+
+
+def encode(value, codec=None):
+    """Serialize 'value' with 'codec', falling back to legacy format."""
+    codec = codec or CODECS["json"]
+    try:
+        return codec.encode(value)
+    except (TypeError, ValueError, OverflowError):
+        return _LEGACY.encode(value)
+
+
+def decode(data):
+    """Read value written by any of the codecs."""
+    if not isinstance(data, str):
+        return data
+    for codec in CODECS.values():
+        if codec.prefix and data.startswith(codec.prefix):
+            try:
+                return codec.decode(data[len(codec.prefix) :])
+            except ValueError:
+                return data
+    return _LEGACY.decode(data)
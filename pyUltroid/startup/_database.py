@@ -5,18 +5,31 @@
 # PLease read the GNU Affero General Public License in
 # <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
 
-import ast
+import asyncio
+import atexit
+import gzip
+import json
 import os
+import shutil
 import sys
+from collections import OrderedDict
+from contextlib import nullcontext
+from itertools import count
+from select import select
+from threading import RLock, Thread, Timer
+from time import sleep, time
 
 from .. import run_as_module
 from . import *
+from ._codec import decode as _decode
+from ._codec import encode, get_codec
 
 if run_as_module:
     from ..configs import Var
 
 
-Redis = MongoClient = psycopg2 = Database = None
+Redis = MongoClient = psycopg2 = sqlite3 = ResponseError = None
+aioredis = AsyncIOMotorClient = asyncpg = None
 if Var.REDIS_URI or Var.REDISHOST:
     try:
         from redis import Redis
@@ -24,6 +37,12 @@ if Var.REDIS_URI or Var.REDISHOST:
         LOGS.info("Installing 'redis' for database.")
         os.system(f"{sys.executable} -m pip install -q redis hiredis")
         from redis import Redis
+    from redis.exceptions import ResponseError
+
+    try:
+        from redis import asyncio as aioredis
+    except ImportError:
+        pass
 elif Var.MONGO_URI:
     try:
         from pymongo import MongoClient
@@ -31,6 +50,12 @@ elif Var.MONGO_URI:
         LOGS.info("Installing 'pymongo' for database.")
         os.system(f"{sys.executable} -m pip install -q pymongo[srv]")
         from pymongo import MongoClient
+    from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+    try:
+        from motor.motor_asyncio import AsyncIOMotorClient
+    except ImportError:
+        pass
 elif Var.DATABASE_URL:
     try:
         import psycopg2
@@ -38,33 +63,185 @@ elif Var.DATABASE_URL:
         LOGS.info("Installing 'pyscopg2' for database.")
         os.system(f"{sys.executable} -m pip install -q psycopg2-binary")
         import psycopg2
-else:
+    from psycopg2.extras import execute_batch
+
     try:
-        from localdb import Database
+        import asyncpg
     except ImportError:
-        LOGS.info("Using local file as database.")
-        os.system(f"{sys.executable} -m pip install -q localdb.json")
-        from localdb import Database
+        pass
+else:
+    import sqlite3
 
 # --------------------------------------------------------------------------------------------- #
 
 
+# marks a key, queued for deletion in write-behind mode
+_DELETED = object()
+
+# seconds, after which a failed 'aflush' is tried again.
+_RETRY_FLUSH = 5
+
+
+# mongo doesn't allow '.' and '$' in field names.
+
+
+def _mongo_field(field):
+    return repr(field).replace("%", "%25").replace(".", "%2E").replace("$", "%24")
+
+
+def _mongo_unfield(field):
+    return _decode(field.replace("%24", "$").replace("%2E", ".").replace("%25", "%"))
+
+
+def _change_node(change):
+    """Process, which made a change in mongo change stream, see 'MongoDB._tag'."""
+    if doc := change.get("fullDocument"):
+        return doc.get("_node")
+    return change.get("updateDescription", {}).get("updatedFields", {}).get("_node")
+
+
+# hash of key -> unix time, for keys set to expire with 'udB.expire'.
+_EXPIRY = "_EXPIRY"
+
+# hash of field -> last access time, for keys bounded with 'udB.set_limit'.
+_ACCESS = "_ACCESS_{}"
+# seconds, within which a field's stored access time isn't updated again.
+_ACCESS_STEP = 60 * 60
+
+# channel, where processes sharing a database announce changed keys.
+_SYNC_CHANNEL = "ultroid_sync"
+
+
+def _in_loop():
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _batch_keys(data):
+    return {key[0] if isinstance(key, tuple) else key for key in data}
+
+
 class _BaseDatabase:
+    # Backends set it, when a native asyncio driver is available.
+    _async = False
+    # 'flush' may run in a timer thread (write-behind mode) or an executor.
+    # Backends, whose connection isn't thread-safe, set it to a RLock, which
+    # is held around those writes, and hold it for their own queries too.
+    _lock = nullcontext()
+
     def __init__(self, *args, **kwargs):
         self._cache = {}
+        self._pending = {}
+        self._flush_lock = RLock()
+        # held by both 'flush' and 'aflush', while writing a batch.
+        self._write_lock = RLock()
+        self._flush_timer = None
+        self._aflush_task = None
+        self._aflushing = False
+        # batch being written by 'aflush'.
+        self._inflight = None
+        # keys, which are known to be stored as hash in backend.
+        self._hashes = set()
+        # key -> (max_fields, ttl), and key -> {field: last access}, see 'set_limit'.
+        self._limits = {}
+        self._access = {}
+        # key -> number, changed on every write to key, see 'version'.
+        self._versions = {}
+        self._counter = count(1)
+        self._base_version = 0
+        # key -> callbacks, see 'watch'.
+        self._watchers = {}
+        # set of keys read or written, while set (by startup profiler).
+        self.touched = None
+        # cache holds every key (see 'prefetch'), so keys not in it aren't set,
+        # except '_stale' ones, changed by another process.
+        self._complete = False
+        self._stale = set()
+        self._write_behind = kwargs.get("write_behind", Var.DB_WRITE_BEHIND)
+        self._codec = get_codec(kwargs.get("codec", Var.DB_CODEC))
+        if self._async and not kwargs.get("use_async", Var.DB_ASYNC):
+            self._async = False
+        # id of this process, to ignore own change notifications.
+        self._node = os.urandom(6).hex()
+        self._sync = kwargs.get("sync", Var.DB_SYNC)
+        if self._sync:
+            # listeners run in threads, and hand changes to this loop.
+            self._loop = asyncio.get_event_loop()
+            try:
+                self._listen()
+            except Exception as er:
+                LOGS.exception(er)
+                LOGS.info("Database cache will not be synced with other processes.")
+        atexit.register(self.flush)
 
     def get_key(self, key):
+        if self.touched is not None:
+            self.touched.add(key)
+        if key != _EXPIRY and self._expired(key):
+            self.del_key(key)
+            return None
         if key in self._cache:
             return self._cache[key]
+        if self._pending.get(key) is _DELETED or self._known_missing(key):
+            return None
         value = self._get_data(key)
         self._cache.update({key: value})
+        self._stale.discard(key)
         return value
 
+    def _known_missing(self, key):
+        return self._complete and key not in self._stale
+
     def re_cache(self):
-        self._cache.clear()
+        self.flush()
+        self._clear_cache()
         for key in self.keys():
             self._cache.update({key: self.get_key(key)})
 
+    def prefetch(self):
+        """Load whole database into cache with bulk reads, so that later
+        reads (even of keys which are not set) don't go to backend."""
+        # keys, which 're_cache' couldn't read, are marked stale.
+        self._stale.clear()
+        self.re_cache()
+        self._complete = True
+
+    def cached_keys(self):
+        """Same as 'keys', but from cache after 'prefetch'."""
+        if self._complete and not self._stale:
+            return list(self._cache)
+        return self.keys()
+
+    def version(self, key):
+        """Number which changes, whenever value of 'key' is changed.
+        Lets callers keep data derived from a key, till it is changed."""
+        return self._versions.get(key, self._base_version)
+
+    def watch(self, key, callback):
+        """Call 'callback(key)' whenever value of 'key' is changed."""
+        callbacks = self._watchers.setdefault(key, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def _bump(self, key):
+        if self.touched is not None:
+            self.touched.add(key)
+        self._versions[key] = next(self._counter)
+        for callback in self._watchers.get(key, []):
+            callback(key)
+
+    def _clear_cache(self):
+        self._cache.clear()
+        self._complete = False
+        self._versions.clear()
+        self._base_version = next(self._counter)
+        for key, callbacks in self._watchers.items():
+            for callback in callbacks:
+                callback(key)
+
     def ping(self):
         return 1
 
@@ -76,27 +253,466 @@ class _BaseDatabase:
         return []
 
     def del_key(self, key):
+        self._bump(key)
         if key in self._cache:
             del self._cache[key]
+        self._hashes.discard(key)
+        self._access.pop(key, None)
+        self._clear_expiry(key)
+        if self._defer_writes():
+            self._queue_write(key, _DELETED)
+            return True
         self.delete(key)
+        self._notify([key])
         return True
 
     def _get_data(self, key=None, data=None):
         if key:
             data = self.get(str(key))
         if data and isinstance(data, str):
-            try:
-                data = ast.literal_eval(data)
-            except BaseException:
-                pass
+            data = _decode(data)
         return data
 
+    def _encode(self, value):
+        return encode(value, self._codec)
+
     def set_key(self, key, value, cache_only=False):
         value = self._get_data(data=value)
         self._cache[key] = value
+        self._bump(key)
         if cache_only:
             return
-        return self.set(str(key), str(value))
+        self._hashes.discard(key)
+        self._access.pop(key, None)
+        self._clear_expiry(key)
+        if self._defer_writes():
+            return self._queue_write(key, value)
+        result = self.set(str(key), self._encode(value))
+        self._notify([key])
+        return result
+
+    # ------------------------------ hashes ------------------------------ #
+
+    def _get_hash(self, key, create=False):
+        data = self.get_key(key)
+        if not data:
+            data = {}
+            if create:
+                self._cache[key] = data
+        return data
+
+    def hget(self, key, field, default=None):
+        """Get 'field' from dict stored at 'key'."""
+        data = self._get_hash(key)
+        if key in self._limits and field in data and not self._touch(key, field):
+            return default
+        return data.get(field, default)
+
+    def hkeys(self, key):
+        """List fields of dict stored at 'key'."""
+        return list(self._get_hash(key))
+
+    def hset(self, key, field, value):
+        """Set 'field' of dict stored at 'key', writing only that field to backend."""
+        self._get_hash(key, create=True)[field] = value
+        self._bump(key)
+        if self._defer_writes():
+            result = self._queue_write((key, field), value)
+        else:
+            result = self._hset(key, field, value)
+            self._notify([key])
+        if key in self._limits:
+            self._touch(key, field, write=True)
+        return result
+
+    def hdel(self, key, field):
+        """Remove 'field' from dict stored at 'key'."""
+        data = self._get_hash(key)
+        if field not in data:
+            return False
+        del data[field]
+        self._bump(key)
+        if key in self._access:
+            self._access[key].pop(field, None)
+        if self._defer_writes():
+            return self._queue_write((key, field), _DELETED)
+        result = self._hdel(key, field)
+        self._notify([key])
+        return result
+
+    # Backends without native hash support, rewrite the whole key.
+
+    def _hset(self, key, field, value):
+        return self.set(str(key), self._encode(self._cache.get(key)))
+
+    def _hdel(self, key, field):
+        return self.set(str(key), self._encode(self._cache.get(key)))
+
+    # ------------------------- expiry & limits -------------------------- #
+
+    def set_limit(self, key, max_fields=None, ttl=None):
+        """Keep dict stored at 'key' bounded.
+        Fields not accessed for 'ttl' seconds expire, and least recently used
+        fields are removed, once there are more than 'max_fields' of them.
+        Access times are stored in '_ACCESS_<key>' (updated at most once in
+        '_ACCESS_STEP', with next flush of other writes), fields without one
+        count as accessed at startup."""
+        self._limits[key] = (max_fields, ttl)
+
+    def _touch(self, key, field, write=False):
+        """Mark 'field' as used and evict stale fields of 'key'.
+        Returns False, if 'field' itself had expired (and was removed)."""
+        max_fields, ttl = self._limits[key]
+        now = time()
+        access_key = _ACCESS.format(key)
+        access = self._access.get(key)
+        if access is None:
+            stored = self.get_key(access_key) or {}
+            fields = self._cache.get(key) or {}
+            access = self._access[key] = OrderedDict(
+                sorted(
+                    ((_, stored.get(_, now)) for _ in fields), key=lambda _: _[1]
+                )
+            )
+            self._hdel_many(access_key, [_ for _ in stored if _ not in fields])
+        if not write and ttl and access.get(field, now) < now - ttl:
+            self._hdel_many(key, [field])
+            return False
+        access[field] = now
+        access.move_to_end(field)
+        if now - self.hget(access_key, field, 0) >= _ACCESS_STEP:
+            self._get_hash(access_key, create=True)[field] = int(now)
+            # written along with next flush, instead of a write of its own.
+            self._queue_write((access_key, field), int(now), schedule=False)
+        # fields are in order of last access, so stale ones are at the start.
+        evict = []
+        for oldest, used in access.items():
+            if (max_fields and len(access) - len(evict) > max_fields) or (
+                ttl and used < now - ttl
+            ):
+                evict.append(oldest)
+            else:
+                break
+        self._hdel_many(key, evict)
+        return True
+
+    def _hdel_many(self, key, fields):
+        """Remove 'fields' from dict stored at 'key' (and their access
+        times, for bounded keys), in a single batch write."""
+        data = self._get_hash(key)
+        if not (fields := [_ for _ in fields if _ in data]):
+            return
+        for field in fields:
+            del data[field]
+            self._queue_write((key, field), _DELETED, schedule=False)
+        self._bump(key)
+        if access := self._access.get(key):
+            for field in fields:
+                access.pop(field, None)
+            self._hdel_many(_ACCESS.format(key), fields)
+        if self._defer_writes():
+            self._schedule_flush()
+        else:
+            self.flush()
+
+    def expire(self, key, seconds):
+        """Delete 'key' after 'seconds'. Like in redis, setting key again clears it."""
+        if self.get_key(key) is None:
+            return False
+        self.hset(_EXPIRY, key, time() + seconds)
+        return True
+
+    def _expired(self, key):
+        expiry = self._cache.get(_EXPIRY)
+        if expiry is None:
+            expiry = self.get_key(_EXPIRY)
+        return bool(expiry) and key in expiry and expiry[key] <= time()
+
+    def _clear_expiry(self, key):
+        if key != _EXPIRY and key in (self._cache.get(_EXPIRY) or {}):
+            self.hdel(_EXPIRY, key)
+
+    # --------------------------- write-behind --------------------------- #
+
+    def _defer_writes(self):
+        """Whether writes should be queued, instead of blocking the caller."""
+        return bool(self._write_behind) or (self._async and _in_loop())
+
+    def _queue_write(self, key, value, schedule=True):
+        """Queue a write, to be flushed in batch with other pending writes."""
+        with self._flush_lock:
+            if isinstance(key, tuple):
+                if self._pending.get(key[0], _DELETED) is not _DELETED:
+                    # whole key is already queued, which covers this field.
+                    return True
+            else:
+                # whole key is being rewritten, drop queued field writes.
+                for _ in [
+                    _ for _ in self._pending if isinstance(_, tuple) and _[0] == key
+                ]:
+                    del self._pending[_]
+            self._pending.pop(key, None)
+            self._pending[key] = value
+            if schedule:
+                self._schedule_flush()
+        return True
+
+    def _schedule_flush(self):
+        if self._write_behind:
+            if not self._flush_timer:
+                self._flush_timer = Timer(self._write_behind, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        elif _in_loop() and not (self._aflush_task and not self._aflush_task.done()):
+            self._aflush_task = asyncio.get_running_loop().create_task(self.aflush())
+
+    def _take_pending(self):
+        with self._flush_lock:
+            if self._flush_timer:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            data, self._pending = self._pending, {}
+        return data
+
+    def _restore_pending(self, data):
+        # keep the failed batch, unless those keys were changed again.
+        with self._flush_lock:
+            data.update(self._pending)
+            self._pending = data
+            if self._write_behind:
+                self._schedule_flush()
+            elif _in_loop():
+                asyncio.get_running_loop().call_later(
+                    _RETRY_FLUSH, self._schedule_flush
+                )
+
+    def _write_many(self, data):
+        """Write a batch of pending keys to the backend.
+        Backends can override this to use native batch operations."""
+        for key, value in data.items():
+            if isinstance(key, tuple):
+                if value is _DELETED:
+                    self._hdel(*key)
+                else:
+                    self._hset(*key, value)
+            elif value is _DELETED:
+                self.delete(str(key))
+            else:
+                self.set(str(key), self._encode(value))
+
+    def flush(self):
+        """Write all pending changes to the backend.
+        Waits for 'aflush' running in another thread. In the event loop
+        thread, 'aflush' can't go on till this returns, so its batch is
+        written here too."""
+        with self._write_lock:
+            inflight = self._inflight or {}
+            data = self._take_pending()
+            if not (inflight or data):
+                return
+            batch = {**inflight, **data}
+            try:
+                with self._lock:
+                    self._write_many(batch)
+            except BaseException as er:
+                LOGS.exception(er)
+                self._restore_pending(data)
+                return
+            inflight.clear()
+        self._notify(_batch_keys(batch))
+
+    # ---------------------------- cache sync ---------------------------- #
+
+    # With DB_SYNC, processes sharing a database (like in multi_client.py)
+    # announce keys they changed, and others drop those keys from cache.
+    # Backends implement '_listen' and '_publish'.
+
+    def _listen(self):
+        LOGS.info(f"Cache sync is not supported on {self.name}.")
+
+    def _publish(self, message):
+        pass
+
+    async def _apublish(self, message):
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._publish, message
+        )
+
+    def _sync_messages(self, keys):
+        keys = sorted({str(key) for key in keys})
+        # small chunks, as postgres limits size of notification payload.
+        for _ in range(0, len(keys), 100):
+            yield json.dumps([self._node, keys[_ : _ + 100]])
+
+    def _notify(self, keys):
+        if not self._sync:
+            return
+        try:
+            for message in self._sync_messages(keys):
+                self._publish(message)
+        except Exception as er:
+            LOGS.exception(er)
+
+    async def _anotify(self, keys):
+        if not self._sync:
+            return
+        try:
+            for message in self._sync_messages(keys):
+                await self._apublish(message)
+        except Exception as er:
+            LOGS.exception(er)
+
+    def _on_sync_message(self, message):
+        try:
+            node, keys = json.loads(message)
+        except ValueError:
+            return
+        if node != self._node:
+            self._invalidate_soon(keys)
+
+    def _invalidate_soon(self, keys):
+        """'_invalidate' from a listener thread. Runs it in event loop
+        thread, as watchers of keys use database connections of that thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._invalidate, keys)
+        except RuntimeError:
+            # event loop is closed.
+            pass
+
+    def _invalidate(self, keys):
+        """Drop keys changed by another process from cache, to be read again on next access."""
+        with self._flush_lock:
+            pending = {str(_) for _ in _batch_keys(self._pending)}
+            for key in keys:
+                # local change, yet to be written, wins.
+                if key in pending:
+                    continue
+                self._cache.pop(key, None)
+                if self._complete:
+                    self._stale.add(key)
+                self._bump(key)
+                self._hashes.discard(key)
+                self._access.pop(key, None)
+
+    # ------------------------------ asyncio ----------------------------- #
+
+    # Backends override these with native asyncio drivers,
+    # otherwise sync methods are used.
+
+    async def _aget(self, key):
+        return self.get(key)
+
+    async def _awrite_many(self, data):
+        with self._lock:
+            return self._write_many(data)
+
+    def _new_hashes(self, data):
+        """Keys in batch, which are yet to be converted to hash in backend."""
+        return {str(key[0]) for key in data if isinstance(key, tuple)} - self._hashes
+
+    async def _aprepare_hashes(self, data):
+        for key in self._new_hashes(data):
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._to_hash, key
+            )
+
+    async def aflush(self):
+        """Write all pending changes to the backend, without blocking event loop."""
+        # batches are written one by one, to keep the order of writes.
+        # lock is polled, not to block event loop while 'flush' holds it.
+        while self._aflushing or not self._write_lock.acquire(blocking=False):
+            await asyncio.sleep(0.01)
+        self._aflushing = True
+        try:
+            while data := self._take_pending():
+                self._inflight = data
+                try:
+                    await self._awrite_many(data)
+                except BaseException as er:
+                    LOGS.exception(er)
+                    # unless 'flush' has written it meanwhile.
+                    self._restore_pending(data)
+                    return
+                finally:
+                    self._inflight = None
+                await self._anotify(_batch_keys(data))
+        finally:
+            self._aflushing = False
+            self._write_lock.release()
+
+    async def aget_key(self, key):
+        if self.touched is not None:
+            self.touched.add(key)
+        if key != _EXPIRY and self._expired(key):
+            await self.adel_key(key)
+            return None
+        if key in self._cache:
+            return self._cache[key]
+        if self._pending.get(key) is _DELETED or self._known_missing(key):
+            return None
+        value = self._get_data(data=await self._aget(str(key)))
+        self._cache.update({key: value})
+        self._stale.discard(key)
+        return value
+
+    async def aset_key(self, key, value):
+        value = self._get_data(data=value)
+        self._cache[key] = value
+        self._bump(key)
+        self._hashes.discard(key)
+        self._access.pop(key, None)
+        self._clear_expiry(key)
+        self._queue_write(key, value, schedule=bool(self._write_behind))
+        if not self._write_behind:
+            await self.aflush()
+        return True
+
+    async def adel_key(self, key):
+        self._bump(key)
+        if key in self._cache:
+            del self._cache[key]
+        self._hashes.discard(key)
+        self._access.pop(key, None)
+        self._clear_expiry(key)
+        self._queue_write(key, _DELETED, schedule=bool(self._write_behind))
+        if not self._write_behind:
+            await self.aflush()
+        return True
+
+    async def ahget(self, key, field, default=None):
+        data = await self.aget_key(key) or {}
+        if key in self._limits and field in data and not self._touch(key, field):
+            return default
+        return data.get(field, default)
+
+    async def ahkeys(self, key):
+        return list(await self.aget_key(key) or {})
+
+    async def ahset(self, key, field, value):
+        data = await self.aget_key(key)
+        if not data:
+            data = self._cache[key] = {}
+        data[field] = value
+        self._bump(key)
+        self._queue_write((key, field), value, schedule=bool(self._write_behind))
+        if key in self._limits:
+            self._touch(key, field, write=True)
+        if not self._write_behind:
+            await self.aflush()
+        return True
+
+    async def ahdel(self, key, field):
+        data = await self.aget_key(key) or {}
+        if field not in data:
+            return False
+        del data[field]
+        self._bump(key)
+        if key in self._access:
+            self._access[key].pop(field, None)
+        self._queue_write((key, field), _DELETED, schedule=bool(self._write_behind))
+        if not self._write_behind:
+            await self.aflush()
+        return True
 
     def rename(self, key1, key2):
         _ = self.get_key(key1)
@@ -108,14 +724,39 @@ class _BaseDatabase:
 
 
 class MongoDB(_BaseDatabase):
-    def __init__(self, key, dbname="UltroidDB"):
+    def __init__(self, key, dbname="UltroidDB", collection="Ultroid"):
+        self._uri = key
         self.dB = MongoClient(key, serverSelectionTimeoutMS=5000)
         self.db = self.dB[dbname]
+        self.col = self.db[collection]
+        self._acol = None
+        self._async = bool(AsyncIOMotorClient)
         super().__init__()
+        self._migrate()
 
     def __repr__(self):
         return f"<Ultroid.MonGoDB\n -total_keys: {len(self.keys())}\n>"
 
+    def _migrate(self):
+        """Move keys from old layout (a collection per key) to single collection."""
+        old = [
+            name
+            for name in self.db.list_collection_names()
+            if name != self.col.name and not name.startswith("system.")
+        ]
+        if not old:
+            return
+        LOGS.info("Migrating MongoDB to single collection...")
+        requests = []
+        for name in old:
+            if x := self.db[name].find_one({"_id": name}):
+                requests.append(ReplaceOne({"_id": name}, x, upsert=True))
+        if requests:
+            self.col.bulk_write(requests, ordered=False)
+        for name in old:
+            self.db.drop_collection(name)
+        LOGS.info(f"Migrated {len(requests)} keys to '{self.col.name}' collection.")
+
     @property
     def name(self):
         return "Mongo"
@@ -129,25 +770,167 @@ class MongoDB(_BaseDatabase):
             return True
 
     def keys(self):
-        return self.db.list_collection_names()
+        return [x["_id"] for x in self.col.find({}, {"_id": 1})]
+
+    def _from_doc(self, x):
+        if "fields" in x:
+            self._hashes.add(x["_id"])
+            return {
+                _mongo_unfield(field): _decode(value)
+                for field, value in x["fields"].items()
+            }
+        return x["value"]
+
+    def re_cache(self):
+        self.flush()
+        self._clear_cache()
+        for x in self.col.find({}):
+            self._cache[x["_id"]] = self._get_data(data=self._from_doc(x))
+
+    def _tag(self, doc):
+        """Mark a write with id of this process, for '_listen' to skip it."""
+        if self._sync:
+            doc["_node"] = self._node
+        return doc
+
+    def _unset(self, path):
+        update = {"$unset": {path: ""}}
+        # '$set' can't be empty.
+        if self._sync:
+            update["$set"] = self._tag({})
+        return update
 
     def set(self, key, value):
-        if key in self.keys():
-            self.db[key].replace_one({"_id": key}, {"value": str(value)})
-        else:
-            self.db[key].insert_one({"_id": key, "value": str(value)})
+        self.col.replace_one(
+            {"_id": key}, self._tag({"value": str(value)}), upsert=True
+        )
         return True
 
     def delete(self, key):
-        self.db.drop_collection(key)
+        self.col.delete_one({"_id": key})
 
     def get(self, key):
-        if x := self.db[key].find_one({"_id": key}):
-            return x["value"]
+        if x := self.col.find_one({"_id": key}):
+            return self._from_doc(x)
+
+    def _to_hash(self, key):
+        """Convert a key stored as single value, to sub-document of fields."""
+        if key in self._hashes:
+            return
+        x = self.col.find_one({"_id": key}, {"fields": 1})
+        if not x or "fields" not in x:
+            data = self._cache.get(key) or {}
+            self.col.replace_one(
+                {"_id": key},
+                self._tag(
+                    {
+                        "fields": {
+                            _mongo_field(field): self._encode(value)
+                            for field, value in data.items()
+                        }
+                    }
+                ),
+                upsert=True,
+            )
+        self._hashes.add(key)
+
+    def _hset(self, key, field, value):
+        key = str(key)
+        self._to_hash(key)
+        self.col.update_one(
+            {"_id": key},
+            {
+                "$set": self._tag(
+                    {f"fields.{_mongo_field(field)}": self._encode(value)}
+                )
+            },
+            upsert=True,
+        )
+        return True
+
+    def _hdel(self, key, field):
+        key = str(key)
+        self._to_hash(key)
+        self.col.update_one(
+            {"_id": key},
+            self._unset(f"fields.{_mongo_field(field)}"),
+        )
+        return True
+
+    def _bulk_requests(self, data):
+        requests = []
+        for key, value in data.items():
+            if isinstance(key, tuple):
+                path = f"fields.{_mongo_field(key[1])}"
+                if value is _DELETED:
+                    requests.append(
+                        UpdateOne({"_id": str(key[0])}, self._unset(path))
+                    )
+                else:
+                    requests.append(
+                        UpdateOne(
+                            {"_id": str(key[0])},
+                            {"$set": self._tag({path: self._encode(value)})},
+                            upsert=True,
+                        )
+                    )
+            elif value is _DELETED:
+                requests.append(DeleteOne({"_id": str(key)}))
+            else:
+                requests.append(
+                    ReplaceOne(
+                        {"_id": str(key)},
+                        self._tag({"value": self._encode(value)}),
+                        upsert=True,
+                    )
+                )
+        return requests
+
+    def _write_many(self, data):
+        for key in self._new_hashes(data):
+            self._to_hash(key)
+        if requests := self._bulk_requests(data):
+            self.col.bulk_write(requests, ordered=True)
+
+    def _listen(self):
+        def _watch():
+            # change streams need a replica set (like MongoDB Atlas).
+            try:
+                with self.col.watch() as stream:
+                    for change in stream:
+                        if _change_node(change) == self._node:
+                            continue
+                        if key := change.get("documentKey", {}).get("_id"):
+                            self._invalidate_soon([key])
+                        elif change["operationType"] in ["drop", "invalidate"]:
+                            self._invalidate_soon(list(self._cache))
+            except Exception as er:
+                LOGS.info(f"MongoDB change stream stopped: {er}")
+
+        Thread(target=_watch, daemon=True).start()
+
+    @property
+    def acol(self):
+        """Collection on motor client, for asyncio."""
+        if not self._acol:
+            client = AsyncIOMotorClient(self._uri, serverSelectionTimeoutMS=5000)
+            self._acol = client[self.db.name][self.col.name]
+        return self._acol
+
+    async def _aget(self, key):
+        if x := await self.acol.find_one({"_id": key}):
+            return self._from_doc(x)
+
+    async def _awrite_many(self, data):
+        await self._aprepare_hashes(data)
+        if requests := self._bulk_requests(data):
+            await self.acol.bulk_write(requests, ordered=True)
 
     def flushall(self):
-        self.dB.drop_database("UltroidDB")
-        self._cache.clear()
+        self.col.delete_many({})
+        self._clear_cache()
+        self._pending.clear()
+        self._hashes.clear()
         return True
 
 
@@ -159,18 +942,55 @@ class MongoDB(_BaseDatabase):
 # Please use https://elephantsql.com/ !
 
 
+# Prepared once per connection, and used by 'EXECUTE name (...)'.
+_SQL_STATEMENTS = {
+    "ult_get": ("text", "SELECT value FROM UltroidKV WHERE key = $1"),
+    "ult_set": (
+        "text, text",
+        "INSERT INTO UltroidKV (key, value) VALUES ($1, $2) ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value",
+    ),
+    "ult_del": ("text", "DELETE FROM UltroidKV WHERE key = $1"),
+    "ult_hgetall": ("text", "SELECT field, value FROM UltroidHash WHERE key = $1"),
+    "ult_hset": (
+        "text, text, text",
+        "INSERT INTO UltroidHash (key, field, value) VALUES ($1, $2, $3) ON CONFLICT (key, field) DO UPDATE SET value = EXCLUDED.value",
+    ),
+    "ult_hdel": ("text, text", "DELETE FROM UltroidHash WHERE key = $1 AND field = $2"),
+    "ult_hclear": ("text", "DELETE FROM UltroidHash WHERE key = $1"),
+}
+
+# Old table stored keys as unquoted columns, which postgres lowercases.
+# These are the only keys, which are meant to be lowercase.
+_SQL_LOWER_KEYS = ["artist", "calc", "language"]
+
+
+def _sql(name):
+    """Query of prepared statement, with '$n' placeholders, as used by asyncpg."""
+    return _SQL_STATEMENTS[name][1]
+
+
 class SqlDB(_BaseDatabase):
     def __init__(self, url):
         self._url = url
+        # cursor is shared by event loop, flush and notify threads.
+        self._lock = RLock()
         self._connection = None
         self._cursor = None
+        self._pool = None
+        self._async = bool(asyncpg)
         try:
             self._connection = psycopg2.connect(dsn=url)
             self._connection.autocommit = True
             self._cursor = self._connection.cursor()
             self._cursor.execute(
-                "CREATE TABLE IF NOT EXISTS Ultroid (ultroidCli varchar(70))"
+                "CREATE TABLE IF NOT EXISTS UltroidKV (key TEXT PRIMARY KEY, value TEXT)"
             )
+            self._cursor.execute(
+                "CREATE TABLE IF NOT EXISTS UltroidHash (key TEXT, field TEXT, value TEXT, PRIMARY KEY (key, field))"
+            )
+            for name, (types, query) in _SQL_STATEMENTS.items():
+                self._cursor.execute(f"PREPARE {name} ({types}) AS {query}")
+            self._migrate()
         except Exception as error:
             LOGS.exception(error)
             LOGS.info("Invaid SQL Database")
@@ -179,63 +999,244 @@ class SqlDB(_BaseDatabase):
             sys.exit()
         super().__init__()
 
+    def _migrate(self):
+        """Move keys from old 'Ultroid' table (a column per key) to 'UltroidKV'."""
+        with self._lock:
+            self._cursor.execute("SELECT to_regclass('public.ultroid')")
+            if not self._cursor.fetchone()[0]:
+                return
+            LOGS.info("Migrating SQL Database to key/value table...")
+            self._cursor.execute("SELECT * FROM Ultroid")
+            columns = [_[0] for _ in self._cursor.description]
+            data = {}
+            for row in self._cursor.fetchall():
+                for column, value in zip(columns, row):
+                    if column != "ultroidcli" and value and column not in data:
+                        data[column] = value
+            self._cursor.execute("BEGIN")
+            self._execute_batch(
+                "EXECUTE ult_set (%s, %s)",
+                [
+                    (key if key in _SQL_LOWER_KEYS else key.upper(), value)
+                    for key, value in data.items()
+                ],
+            )
+            # Kept as backup, instead of dropping.
+            self._cursor.execute("ALTER TABLE Ultroid RENAME TO Ultroid_old")
+            self._cursor.execute("COMMIT")
+            LOGS.info(f"Migrated {len(data)} keys from old SQL table.")
+
+    def _execute_batch(self, query, args):
+        if args:
+            execute_batch(self._cursor, query, args)
+
     @property
     def name(self):
         return "SQL"
 
     @property
     def usage(self):
-        self._cursor.execute(
-            "SELECT pg_size_pretty(pg_relation_size('Ultroid')) AS size"
-        )
-        data = self._cursor.fetchall()
-        return int(data[0][0].split()[0])
+        with self._lock:
+            self._cursor.execute(
+                "SELECT pg_total_relation_size('UltroidKV') + pg_total_relation_size('UltroidHash')"
+            )
+            return int(self._cursor.fetchone()[0])
 
     def keys(self):
-        self._cursor.execute(
-            "SELECT column_name FROM information_schema.columns WHERE table_schema = 'public' AND table_name  = 'ultroid'"
-        )  # case sensitive
-        data = self._cursor.fetchall()
-        return [_[0] for _ in data]
+        with self._lock:
+            self._cursor.execute(
+                "SELECT key FROM UltroidKV UNION SELECT key FROM UltroidHash"
+            )
+            return [_[0] for _ in self._cursor.fetchall()]
 
-    def get(self, variable):
-        try:
-            self._cursor.execute(f"SELECT {variable} FROM Ultroid")
-        except psycopg2.errors.UndefinedColumn:
-            return None
-        data = self._cursor.fetchall()
-        if not data:
-            return None
-        if len(data) >= 1:
-            for i in data:
-                if i[0]:
-                    return i[0]
+    def re_cache(self):
+        self.flush()
+        self._clear_cache()
+        with self._lock:
+            self._cursor.execute("SELECT key, value FROM UltroidKV")
+            values = self._cursor.fetchall()
+            self._cursor.execute("SELECT key, field, value FROM UltroidHash")
+            fields = self._cursor.fetchall()
+        for key, value in values:
+            self._cache[key] = self._get_data(data=value)
+        for key, field, value in fields:
+            self._hashes.add(key)
+            self._cache.setdefault(key, {})[_decode(field)] = _decode(value)
+
+    def _hgetall(self, key):
+        with self._lock:
+            self._cursor.execute("EXECUTE ult_hgetall (%s)", (key,))
+            if data := self._cursor.fetchall():
+                self._hashes.add(key)
+                return {_decode(field): _decode(value) for field, value in data}
+
+    def get(self, key):
+        with self._lock:
+            self._cursor.execute("EXECUTE ult_get (%s)", (key,))
+            if data := self._cursor.fetchone():
+                return data[0]
+            return self._hgetall(key)
 
     def set(self, key, value):
-        try:
-            self._cursor.execute(f"ALTER TABLE Ultroid DROP COLUMN IF EXISTS {key}")
-        except (psycopg2.errors.UndefinedColumn, psycopg2.errors.SyntaxError):
-            pass
-        except BaseException as er:
-            LOGS.exception(er)
-        self._cache.update({key: value})
-        self._cursor.execute(f"ALTER TABLE Ultroid ADD {key} TEXT")
-        self._cursor.execute(f"INSERT INTO Ultroid ({key}) values (%s)", (str(value),))
-        return True
+        with self._lock:
+            self._cursor.execute(
+                "EXECUTE ult_set (%s, %s); EXECUTE ult_hclear (%s)",
+                (key, str(value), key),
+            )
+            return True
 
     def delete(self, key):
-        try:
-            self._cursor.execute(f"ALTER TABLE Ultroid DROP COLUMN {key}")
-        except psycopg2.errors.UndefinedColumn:
-            return False
-        return True
+        with self._lock:
+            self._cursor.execute(
+                "EXECUTE ult_del (%s); EXECUTE ult_hclear (%s)", (key, key)
+            )
+            return True
+
+    def _to_hash(self, key):
+        """Move a key stored as single value, to rows of 'UltroidHash'."""
+        with self._lock:
+            if key in self._hashes:
+                return
+            data = self._cache.get(key) or {}
+            self._cursor.execute("BEGIN")
+            self._cursor.execute("EXECUTE ult_del (%s)", (key,))
+            self._execute_batch(
+                "EXECUTE ult_hset (%s, %s, %s)",
+                [
+                    (key, repr(field), self._encode(value))
+                    for field, value in data.items()
+                ],
+            )
+            self._cursor.execute("COMMIT")
+            self._hashes.add(key)
+
+    def _hset(self, key, field, value):
+        key = str(key)
+        with self._lock:
+            self._to_hash(key)
+            self._cursor.execute(
+                "EXECUTE ult_hset (%s, %s, %s)",
+                (key, repr(field), self._encode(value)),
+            )
+            return True
+
+    def _hdel(self, key, field):
+        key = str(key)
+        with self._lock:
+            self._to_hash(key)
+            self._cursor.execute("EXECUTE ult_hdel (%s, %s)", (key, repr(field)))
+            return True
+
+    def _batch_args(self, data):
+        sets, dels, hsets, hdels = [], [], [], []
+        for key, value in data.items():
+            if isinstance(key, tuple):
+                if value is _DELETED:
+                    hdels.append((str(key[0]), repr(key[1])))
+                else:
+                    hsets.append((str(key[0]), repr(key[1]), self._encode(value)))
+            elif value is _DELETED:
+                dels.append((str(key),))
+            else:
+                sets.append((str(key), self._encode(value)))
+        return sets, dels, hsets, hdels
+
+    def _write_many(self, data):
+        with self._lock:
+            for key in self._new_hashes(data):
+                self._to_hash(key)
+            sets, dels, hsets, hdels = self._batch_args(data)
+            self._cursor.execute("BEGIN")
+            try:
+                self._execute_batch("EXECUTE ult_set (%s, %s)", sets)
+                self._execute_batch("EXECUTE ult_del (%s)", dels)
+                self._execute_batch(
+                    "EXECUTE ult_hclear (%s)", [(_[0],) for _ in sets + dels]
+                )
+                self._execute_batch("EXECUTE ult_hset (%s, %s, %s)", hsets)
+                self._execute_batch("EXECUTE ult_hdel (%s, %s)", hdels)
+            except BaseException:
+                self._cursor.execute("ROLLBACK")
+                raise
+            self._cursor.execute("COMMIT")
+
+    def _listen(self):
+        # separate connection, as notifications are received between queries.
+        conn = psycopg2.connect(dsn=self._url)
+        conn.autocommit = True
+        conn.cursor().execute(f"LISTEN {_SYNC_CHANNEL}")
+
+        def _poll():
+            while True:
+                try:
+                    if select([conn], [], [], 5)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            self._on_sync_message(conn.notifies.pop(0).payload)
+                except Exception as er:
+                    LOGS.exception(er)
+                    sleep(5)
+
+        Thread(target=_poll, daemon=True).start()
+
+    def _publish(self, message):
+        with self._lock:
+            self._cursor.execute("SELECT pg_notify(%s, %s)", (_SYNC_CHANNEL, message))
+
+    async def _apublish(self, message):
+        pool = await self._apool()
+        await pool.execute("SELECT pg_notify($1, $2)", _SYNC_CHANNEL, message)
+
+    async def _apool(self):
+        if not self._pool:
+            self._pool = await asyncpg.create_pool(self._url, min_size=1, max_size=4)
+        return self._pool
+
+    async def _aget(self, key):
+        pool = await self._apool()
+        value = await pool.fetchval(_sql("ult_get"), key)
+        if value is not None:
+            return value
+        if data := await pool.fetch(_sql("ult_hgetall"), key):
+            self._hashes.add(key)
+            return {_decode(field): _decode(value) for field, value in data}
+
+    async def _awrite_many(self, data):
+        sets, dels, hsets, hdels = self._batch_args(data)
+        new_hashes = self._new_hashes(data)
+        pool = await self._apool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                for key in new_hashes:
+                    fields = self._cache.get(key) or {}
+                    await conn.execute(_sql("ult_del"), key)
+                    await conn.executemany(
+                        _sql("ult_hset"),
+                        [
+                            (key, repr(field), self._encode(value))
+                            for field, value in fields.items()
+                        ],
+                    )
+                if sets:
+                    await conn.executemany(_sql("ult_set"), sets)
+                if sets or dels:
+                    await conn.executemany(
+                        _sql("ult_hclear"), [(_[0],) for _ in sets + dels]
+                    )
+                if dels:
+                    await conn.executemany(_sql("ult_del"), dels)
+                if hsets:
+                    await conn.executemany(_sql("ult_hset"), hsets)
+                if hdels:
+                    await conn.executemany(_sql("ult_hdel"), hdels)
+        self._hashes.update(new_hashes)
 
     def flushall(self):
-        self._cache.clear()
-        self._cursor.execute("DROP TABLE Ultroid")
-        self._cursor.execute(
-            "CREATE TABLE IF NOT EXISTS Ultroid (ultroidCli varchar(70))"
-        )
+        self._clear_cache()
+        self._pending.clear()
+        self._hashes.clear()
+        with self._lock:
+            self._cursor.execute("TRUNCATE UltroidKV, UltroidHash")
         return True
 
 
@@ -284,40 +1285,371 @@ class RedisDB(_BaseDatabase):
                 kwargs["password"] = os.environ.get(f"QOVERY_REDIS_{hash_}_PASSWORD")
         self.db = Redis(**kwargs)
         self.set = self.db.set
-        self.get = self.db.get
         self.keys = self.db.keys
         self.delete = self.db.delete
+        self._kwargs = kwargs
+        self._adb = None
+        self._async = bool(aioredis)
         super().__init__()
 
     @property
     def name(self):
         return "Redis"
 
+    def get(self, key):
+        try:
+            return self.db.get(key)
+        except ResponseError:
+            # WRONGTYPE, key is stored as a hash.
+            self._hashes.add(key)
+            return {
+                _decode(field): _decode(value)
+                for field, value in self.db.hgetall(key).items()
+            }
+
+    def re_cache(self):
+        self.flush()
+        self._clear_cache()
+        keys = self.db.keys()
+        if not keys:
+            return
+        # two round-trips in all: types of keys, then their values.
+        pipe = self.db.pipeline(transaction=False)
+        for key in keys:
+            pipe.type(key)
+        types = pipe.execute()
+        pipe = self.db.pipeline(transaction=False)
+        for key, type_ in zip(keys, types):
+            if type_ == "hash":
+                pipe.hgetall(key)
+            else:
+                pipe.get(key)
+        for key, type_, value in zip(keys, types, pipe.execute(raise_on_error=False)):
+            if isinstance(value, Exception):
+                # like WRONGTYPE, if key was changed meanwhile, read it again later.
+                self._stale.add(key)
+                continue
+            if type_ == "hash":
+                self._hashes.add(key)
+                value = {_decode(field): _decode(val) for field, val in value.items()}
+            elif type_ != "string":
+                continue
+            self._cache[key] = self._get_data(data=value)
+
+    def _to_hash(self, key):
+        """Convert a key stored as string, to redis hash."""
+        if key in self._hashes:
+            return
+        if self.db.type(str(key)) == "string":
+            data = self._cache.get(key) or {}
+            pipe = self.db.pipeline()
+            pipe.delete(str(key))
+            if data:
+                pipe.hset(
+                    str(key),
+                    mapping={
+                        repr(field): self._encode(value)
+                        for field, value in data.items()
+                    },
+                )
+            pipe.execute()
+        self._hashes.add(key)
+
+    def _hset(self, key, field, value):
+        self._to_hash(key)
+        self.db.hset(str(key), repr(field), self._encode(value))
+        return True
+
+    def _hdel(self, key, field):
+        self._to_hash(key)
+        self.db.hdel(str(key), repr(field))
+        return True
+
+    def expire(self, key, seconds):
+        if not super().expire(key, seconds):
+            return False
+        # key has to be written, before redis can expire it.
+        self.flush()
+        return bool(self.db.expire(str(key), seconds))
+
+    def _fill_pipeline(self, pipe, data):
+        for key, value in data.items():
+            if isinstance(key, tuple):
+                if value is _DELETED:
+                    pipe.hdel(str(key[0]), repr(key[1]))
+                else:
+                    pipe.hset(str(key[0]), repr(key[1]), self._encode(value))
+            elif value is _DELETED:
+                pipe.delete(str(key))
+            else:
+                pipe.set(str(key), self._encode(value))
+        return pipe
+
+    def _write_many(self, data):
+        for key in self._new_hashes(data):
+            self._to_hash(key)
+        self._fill_pipeline(self.db.pipeline(transaction=False), data).execute()
+
+    def _listen(self):
+        pubsub = self.db.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(_SYNC_CHANNEL)
+
+        def _poll():
+            while True:
+                try:
+                    if message := pubsub.get_message(timeout=1):
+                        self._on_sync_message(message["data"])
+                except Exception as er:
+                    LOGS.exception(er)
+                    sleep(5)
+
+        Thread(target=_poll, daemon=True).start()
+
+    def _publish(self, message):
+        self.db.publish(_SYNC_CHANNEL, message)
+
+    async def _apublish(self, message):
+        await self.adb.publish(_SYNC_CHANNEL, message)
+
     @property
-    def usage(self):
-        return sum(self.db.memory_usage(x) for x in self.keys())
+    def adb(self):
+        """redis.asyncio client, with same connection options."""
+        if not self._adb:
+            self._adb = aioredis.Redis(**self._kwargs)
+        return self._adb
+
+    async def _aget(self, key):
+        try:
+            return await self.adb.get(key)
+        except ResponseError:
+            self._hashes.add(key)
+            return {
+                _decode(field): _decode(value)
+                for field, value in (await self.adb.hgetall(key)).items()
+            }
+
+    async def _awrite_many(self, data):
+        await self._aprepare_hashes(data)
+        pipe = self._fill_pipeline(self.adb.pipeline(transaction=False), data)
+        await pipe.execute()
 
 
 # --------------------------------------------------------------------------------------------- #
 
 
-class LocalDB(_BaseDatabase):
-    def __init__(self):
-        self.db = Database("ultroid")
-        self.get = self.db.get
-        self.set = self.db.set
-        self.delete = self.db.delete
+_SQLITE_STATEMENTS = {
+    "get": "SELECT value FROM UltroidKV WHERE key = ?",
+    "set": "INSERT OR REPLACE INTO UltroidKV (key, value) VALUES (?, ?)",
+    "del": "DELETE FROM UltroidKV WHERE key = ?",
+    "hgetall": "SELECT field, value FROM UltroidHash WHERE key = ?",
+    "hset": "INSERT OR REPLACE INTO UltroidHash (key, field, value) VALUES (?, ?, ?)",
+    "hdel": "DELETE FROM UltroidHash WHERE key = ? AND field = ?",
+    "hclear": "DELETE FROM UltroidHash WHERE key = ?",
+}
+
+
+class SqliteDB(_BaseDatabase):
+    """Local database, for setups without Redis, Mongo or SQL.
+    Same layout as 'SqlDB', in a WAL-mode sqlite file."""
+
+    def __init__(self, path="ultroid.db"):
+        self.path = path
+        self._lock = RLock()
+        # time of last write and last backup, see 'backup'.
+        self.last_write = self.last_backup = 0
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS UltroidKV (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS UltroidHash (key TEXT, field TEXT, value TEXT, PRIMARY KEY (key, field)) WITHOUT ROWID"
+        )
+        self._migrate()
         super().__init__()
 
+    def __repr__(self):
+        return f"<Ultroid.SqliteDB\n -total_keys: {len(self.keys())}\n>"
+
+    def _migrate(self, old="ultroid.json"):
+        """Import keys from file of old local database (localdb.json)."""
+        if not os.path.exists(old):
+            return
+        LOGS.info("Migrating local database to sqlite...")
+        with open(old) as file:
+            data = json.loads(file.read() or "{}")
+        # values are kept as stored (repr strings), which 'decode' reads.
+        self._executemany(
+            [
+                (
+                    "set",
+                    [
+                        (str(key), value if isinstance(value, str) else encode(value))
+                        for key, value in data.items()
+                    ],
+                )
+            ]
+        )
+        # Kept as backup, instead of deleting.
+        os.rename(old, f"{old}.old")
+        LOGS.info(f"Migrated {len(data)} keys from '{old}'.")
+
+    def _executemany(self, batches):
+        """Run [(statement, rows), ...] in a single transaction."""
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                for name, rows in batches:
+                    if rows:
+                        self._connection.executemany(_SQLITE_STATEMENTS[name], rows)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        self.last_write = time()
+
     @property
     def name(self):
-        return "LocalDB"
+        return "SQLite"
+
+    @property
+    def usage(self):
+        return sum(
+            os.path.getsize(self.path + _)
+            for _ in ["", "-wal"]
+            if os.path.exists(self.path + _)
+        )
 
     def keys(self):
-        return self._cache.keys()
+        with self._lock:
+            data = self._connection.execute(
+                "SELECT key FROM UltroidKV UNION SELECT key FROM UltroidHash"
+            ).fetchall()
+        return [_[0] for _ in data]
 
-    def __repr__(self):
-        return f"<Ultroid.LocalDB\n -total_keys: {len(self.keys())}\n>"
+    def re_cache(self):
+        self.flush()
+        self._clear_cache()
+        with self._lock:
+            values = self._connection.execute(
+                "SELECT key, value FROM UltroidKV"
+            ).fetchall()
+            fields = self._connection.execute(
+                "SELECT key, field, value FROM UltroidHash"
+            ).fetchall()
+        for key, value in values:
+            self._cache[key] = self._get_data(data=value)
+        for key, field, value in fields:
+            self._hashes.add(key)
+            self._cache.setdefault(key, {})[_decode(field)] = _decode(value)
+
+    def get(self, key):
+        with self._lock:
+            value = self._connection.execute(_SQLITE_STATEMENTS["get"], (key,))
+            if value := value.fetchone():
+                return value[0]
+            data = self._connection.execute(
+                _SQLITE_STATEMENTS["hgetall"], (key,)
+            ).fetchall()
+        if data:
+            self._hashes.add(key)
+            return {_decode(field): _decode(value) for field, value in data}
+
+    def set(self, key, value):
+        self._executemany([("set", [(key, str(value))]), ("hclear", [(key,)])])
+        return True
+
+    def delete(self, key):
+        self._executemany([("del", [(key,)]), ("hclear", [(key,)])])
+        return True
+
+    def _hash_rows(self, key):
+        data = self._cache.get(key) or {}
+        return [(key, repr(field), self._encode(value)) for field, value in data.items()]
+
+    def _to_hash(self, key):
+        """Move a key stored as single value, to rows of 'UltroidHash'."""
+        if key in self._hashes:
+            return
+        self._executemany([("del", [(key,)]), ("hset", self._hash_rows(key))])
+        self._hashes.add(key)
+
+    def _hset(self, key, field, value):
+        key = str(key)
+        self._to_hash(key)
+        self._executemany([("hset", [(key, repr(field), self._encode(value))])])
+        return True
+
+    def _hdel(self, key, field):
+        key = str(key)
+        self._to_hash(key)
+        self._executemany([("hdel", [(key, repr(field))])])
+        return True
+
+    def _write_many(self, data):
+        new_hashes = self._new_hashes(data)
+        sets, dels, hsets, hdels = [], [], [], []
+        for key, value in data.items():
+            if isinstance(key, tuple):
+                if value is _DELETED:
+                    hdels.append((str(key[0]), repr(key[1])))
+                else:
+                    hsets.append((str(key[0]), repr(key[1]), self._encode(value)))
+            elif value is _DELETED:
+                dels.append((str(key),))
+            else:
+                sets.append((str(key), self._encode(value)))
+        self._executemany(
+            [("del", [(key,) for key in new_hashes])]
+            + [("hset", self._hash_rows(key)) for key in new_hashes]
+            + [
+                ("set", sets),
+                ("del", dels),
+                ("hclear", [(_[0],) for _ in sets + dels]),
+                ("hset", hsets),
+                ("hdel", hdels),
+            ]
+        )
+        self._hashes.update(new_hashes)
+
+    def flushall(self):
+        self._clear_cache()
+        self._pending.clear()
+        self._hashes.clear()
+        with self._lock:
+            self._connection.execute("DELETE FROM UltroidKV")
+            self._connection.execute("DELETE FROM UltroidHash")
+        self.last_write = time()
+        return True
+
+    @property
+    def dirty(self):
+        """Whether database was changed since last backup."""
+        return self.last_write > self.last_backup
+
+    def backup(self, path="ultroid.db.gz"):
+        """Write a gzip compressed snapshot of database to 'path'.
+        Snapshot is copied in steps using sqlite backup api, so writes aren't blocked.
+
+        Backups are full, not incremental: the backup is a single telegram
+        message (TGDB_URL) edited in place, which has to be restorable on its
+        own. So each upload is the size of whole compressed database, while
+        'dirty' keeps unchanged databases from being uploaded at all."""
+        self.flush()
+        started = time()
+        snapshot = sqlite3.connect(f"{path}.tmp")
+        try:
+            self._connection.backup(snapshot, pages=256)
+        finally:
+            snapshot.close()
+        with open(f"{path}.tmp", "rb") as src, gzip.open(path, "wb") as dest:
+            shutil.copyfileobj(src, dest)
+        os.remove(f"{path}.tmp")
+        self.last_backup = started
+        return path
 
 
 def UltroidDB():
@@ -343,7 +1675,7 @@ def UltroidDB():
             LOGS.critical(
                 "No DB requirement fullfilled!\nPlease install redis, mongo or sql dependencies...\nTill then using local file as database."
             )
-            return LocalDB()
+            return SqliteDB()
     except BaseException as err:
         LOGS.exception(err)
     exit()
@@ -0,0 +1,116 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""Pacing of requests, which have hit FloodWait.
+
+Requests are grouped by kind (sending, editing, changing permissions...)
+and chat. Once a group gets a FloodWait, only its requests are held back
+till the wait is over, and then spaced out at a rate learned from further
+waits, while rest of the requests go on as usual."""
+
+import asyncio
+import time
+from logging import getLogger
+
+from telethon.errors import FloodWaitError, SlowModeWaitError
+from telethon.utils import get_peer_id, is_list_like
+
+# same as 'startup.LOGS', which is only set up when running the bot.
+LOGS = getLogger("pyUltLogs")
+
+_KINDS = {
+    "SendMessageRequest": "send",
+    "SendMediaRequest": "send",
+    "SendMultiMediaRequest": "send",
+    "SendInlineBotResultRequest": "send",
+    "ForwardMessagesRequest": "send",
+    "EditMessageRequest": "edit",
+    "EditInlineBotMessageRequest": "edit",
+    "DeleteMessagesRequest": "delete",
+    "EditBannedRequest": "permissions",
+    "EditChatDefaultBannedRightsRequest": "permissions",
+}
+
+
+class _Bucket:
+    __slots__ = ("until", "interval", "next_at")
+
+    def __init__(self):
+        self.until = self.next_at = 0
+        self.interval = 0.5
+
+
+class RequestGovernor:
+    def __init__(self, max_wait=60, retries=3, on_flood=None):
+        # longer waits are raised to the caller, instead of sleeping.
+        self.max_wait = max_wait
+        self.retries = retries
+        # on_flood(request, per_chat), on every FloodWait.
+        self._on_flood = on_flood
+        self._buckets = {}
+
+    @staticmethod
+    def _key(request):
+        if is_list_like(request):
+            request = request[0]
+        name = type(request).__name__
+        peer = (
+            getattr(request, "peer", None)
+            or getattr(request, "to_peer", None)
+            or getattr(request, "channel", None)
+        )
+        try:
+            peer = get_peer_id(peer) if peer else None
+        except Exception:
+            peer = None
+        return _KINDS.get(name, name), peer
+
+    async def _wait(self, key, request):
+        if not (bucket := self._buckets.get(key)):
+            return
+        now = time.monotonic()
+        if bucket.until - now > self.max_wait:
+            raise FloodWaitError(request, capture=bucket.until - now)
+        start = max(now, bucket.until, bucket.next_at)
+        bucket.next_at = start + bucket.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def _flooded(self, key, seconds):
+        bucket = self._buckets.get(key)
+        if not bucket:
+            bucket = self._buckets[key] = _Bucket()
+        else:
+            bucket.interval = min(bucket.interval * 2, 30)
+        bucket.until = bucket.next_at = time.monotonic() + seconds
+
+    def _passed(self, key):
+        if not (bucket := self._buckets.get(key)):
+            return
+        bucket.interval *= 0.9
+        if bucket.interval < 0.1 and bucket.next_at < time.monotonic():
+            del self._buckets[key]
+
+    async def call(self, send, request, sender=None, **kwargs):
+        """Send 'request' through 'send', waiting out its FloodWaits.
+        'sender' is passed first to 'send', if given (like telethon's '_call')."""
+        key = self._key(request)
+        args = (request,) if sender is None else (sender, request)
+        for attempt in range(self.retries):
+            await self._wait(key, request)
+            try:
+                result = await send(*args, **kwargs)
+            except (FloodWaitError, SlowModeWaitError) as er:
+                self._flooded(key, er.seconds or 1)
+                if self._on_flood:
+                    self._on_flood(request, key[1] is not None)
+                if er.seconds > self.max_wait or attempt == self.retries - 1:
+                    raise
+                LOGS.info(f"Holding back {key[0]} requests in {key[1]} for {er.seconds}s")
+                continue
+            self._passed(key)
+            return result
@@ -0,0 +1,81 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+import asyncio
+import inspect
+import time
+
+from . import LOGS
+
+
+class _Step:
+    __slots__ = ("name", "func", "needs", "timeout", "background", "task")
+
+    def __init__(self, name, func, needs, timeout, background):
+        self.name = name
+        self.func = func
+        self.needs = needs
+        self.timeout = timeout
+        self.background = background
+        self.task = None
+
+
+class StartupGraph:
+    """Startup steps, each started as soon as steps it 'needs' are done,
+    so independent ones run together.
+
+    'run' returns once all foreground steps are done; background steps
+    keep running after it, while bot is already handling updates. Steps
+    can be added after 'run', and started by calling it again; background
+    ones are best added once loop won't be blocked, as their timeouts
+    run from then."""
+
+    def __init__(self, on_step=None, on_done=None):
+        self._steps = {}
+        # on_step(name, seconds), on_done() after all steps.
+        self._on_step = on_step
+        self._on_done = on_done
+
+    def add(self, name, func, needs=(), timeout=None, background=False):
+        """'func' is called without arguments, and may return an awaitable."""
+        for need in needs:
+            if need not in self._steps:
+                raise ValueError(f"Startup step '{name}' needs unknown step '{need}'")
+            if self._steps[need].background and not background:
+                raise ValueError(f"'{name}' can't wait for background step '{need}'")
+        self._steps[name] = _Step(name, func, needs, timeout, background)
+
+    async def _run_step(self, step):
+        if step.needs:
+            await asyncio.gather(*(self._steps[need].task for need in step.needs))
+        start = time.perf_counter()
+        try:
+            result = step.func()
+            if inspect.isawaitable(result):
+                await asyncio.wait_for(result, step.timeout)
+        except asyncio.TimeoutError:
+            LOGS.warning(f"Startup step '{step.name}' timed out after {step.timeout}s")
+        except Exception as er:
+            LOGS.exception(er)
+        if self._on_step:
+            self._on_step(step.name, time.perf_counter() - start)
+
+    async def _wait_background(self, tasks):
+        await asyncio.gather(*tasks)
+        if self._on_done:
+            self._on_done()
+
+    async def run(self):
+        steps = [step for step in self._steps.values() if not step.task]
+        for step in steps:
+            step.task = asyncio.create_task(self._run_step(step))
+        await asyncio.gather(*(step.task for step in steps if not step.background))
+        background = [step.task for step in self._steps.values() if step.background]
+        if background:
+            asyncio.create_task(self._wait_background(background))
+        elif self._on_done:
+            self._on_done()
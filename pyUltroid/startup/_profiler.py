@@ -0,0 +1,124 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+"""Time, memory, handlers and database keys used by each startup phase
+and plugin, saved to 'BOOT_REPORT' and shown with '.bootstats'."""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from . import LOGS
+
+BOOT_REPORT = "resources/boot_report.json"
+
+
+def _rss():
+    """Resident memory of process, in bytes."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # peak memory, where current one is not available.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _handlers():
+    from .. import asst, ultroid_bot
+    from .._misc._pipeline import count_chat_features
+    from .._misc._router import count_routes
+
+    count = count_routes() + count_chat_features()
+    for client in {ultroid_bot, asst}:
+        count += len(client.list_event_handlers())
+    return count
+
+
+class BootProfiler:
+    def __init__(self):
+        self.records = []
+        self.total = None
+
+    @contextmanager
+    def measure(self, name, kind="phase"):
+        from .. import udB
+
+        parent, udB.touched = udB.touched, set()
+        rss, handlers, start = _rss(), _handlers(), time.perf_counter()
+        try:
+            yield
+        finally:
+            touched, udB.touched = udB.touched, parent
+            if parent is not None:
+                parent |= touched
+            self.records.append(
+                {
+                    "name": name,
+                    "kind": kind,
+                    "time": round(time.perf_counter() - start, 4),
+                    "rss": _rss() - rss,
+                    "handlers": _handlers() - handlers,
+                    "keys": sorted(_ for _ in touched if not _.startswith("_")),
+                }
+            )
+
+    def add(self, name, seconds):
+        """Record a step, which ran along with others (so only its time)."""
+        self.records.append(
+            {
+                "name": name,
+                "kind": "phase",
+                "time": round(seconds, 4),
+                "rss": None,
+                "handlers": None,
+                "keys": None,
+            }
+        )
+
+    def finish(self, total):
+        self.total = total
+        self.save()
+
+    def save(self, path=BOOT_REPORT):
+        try:
+            with open(path, "w") as file:
+                json.dump(
+                    {"date": time.time(), "total": self.total, "records": self.records},
+                    file,
+                    indent=1,
+                )
+        except OSError as er:
+            LOGS.warning(f"Can't save startup report: {er}")
+
+    def report(self, limit=10):
+        if not self.records:
+            return "`No startup stats.`"
+        text = "**Startup Stats**\n"
+        if self.total:
+            text += f"\n• Total: `{self.total:.2f}s`"
+        text += f", Memory: `{_rss() / 1024 / 1024:.1f} MB`\n\n**Phases:**"
+        phases = [_ for _ in self.records if _["kind"] == "phase"]
+        plugins = [_ for _ in self.records if _["kind"] != "phase"]
+        for record in phases:
+            text += f"\n• `{record['name']}` - `{record['time']:.2f}s`"
+        text += f"\n\n**Slowest of {len(plugins)} plugins:**"
+        for record in sorted(plugins, key=lambda _: _["time"], reverse=True)[:limit]:
+            text += (
+                f"\n• `{record['kind']}/{record['name']}` - `{record['time']:.2f}s`,"
+                f" `{record['rss'] / 1024 / 1024:+.1f} MB`,"
+                f" {record['handlers']} handlers, {len(record['keys'])} keys"
+            )
+        return text
+
+
+BOOT = BootProfiler()
@@ -49,7 +49,7 @@ from ..fns.helper import download_file, inline_mention, updater
 db_url = 0
 
 
-async def autoupdate_local_database():
+async def _upload_local_database(path):
     from .. import Var, asst, udB, ultroid_bot
 
     global db_url
@@ -64,9 +64,10 @@ async def autoupdate_local_database():
             await asst.edit_message(
                 int(_channel) if _channel.isdigit() else _channel,
                 message=_id,
-                file="database.json",
+                file=path,
                 text="**Do not delete this file.**",
             )
+            return
         except MessageNotModifiedError:
             return
         except MessageIdInvalidError:
@@ -79,7 +80,7 @@ async def autoupdate_local_database():
             or "me"
         )
         msg = await asst.send_message(
-            LOG_CHANNEL, "**Do not delete this file.**", file="database.json"
+            LOG_CHANNEL, "**Do not delete this file.**", file=path
         )
         asst._cache["TGDB_URL"] = msg.message_link
         udB.set_key("TGDB_URL", msg.message_link)
@@ -87,16 +88,53 @@ async def autoupdate_local_database():
         LOGS.error(f"Error on autoupdate_local_database: {ex}")
 
 
+async def autoupdate_local_database(quiet=60, max_delay=900):
+    """Backup local database to Telegram, when it has changed.
+    Waits till there are no writes for 'quiet' seconds (or 'max_delay' seconds
+    have passed since last backup), so bursts of writes are pushed once.
+    Each upload is a full snapshot, see 'SqliteDB.backup'."""
+    from .. import udB
+
+    while True:
+        await asyncio.sleep(quiet / 2)
+        if not udB.dirty:
+            continue
+        now = time.time()
+        if now - udB.last_write < quiet and now - udB.last_backup < max_delay:
+            continue
+        try:
+            path = await asyncio.get_running_loop().run_in_executor(None, udB.backup)
+        except Exception as er:
+            LOGS.exception(er)
+            continue
+        await _upload_local_database(path)
+
+
+async def perf_summary(hours):
+    """Send stats of handlers to log channel, every 'hours'."""
+    from .. import asst, udB
+    from .._misc._perf import PERF
+
+    while True:
+        await asyncio.sleep(float(hours) * 60 * 60)
+        try:
+            await asst.send_message(udB.get_key("LOG_CHANNEL"), PERF.report())
+        except Exception as er:
+            LOGS.exception(er)
+        PERF.reset()
+
+
 def update_envs():
     """Update Var. attributes to udB"""
     from .. import udB
     _envs = [*list(os.environ)]
     if ".env" in os.listdir("."):
         [_envs.append(_) for _ in list(RepositoryEnv(config._find_file(".")).data)]
+    _keys = set(udB.cached_keys())
     for envs in _envs:
         if (
             envs in ["LOG_CHANNEL", "BOT_TOKEN", "BOTMODE", "DUAL_MODE", "language"]
-            or envs in udB.keys()
+            or envs in _keys
         ):
             if _value := os.environ.get(envs):
                 udB.set_key(envs, _value)
@@ -511,7 +549,7 @@ def _version_changes(udb):
     ]:
         key = udb.get_key(_)
         if key and str(key)[0] != "[":
-            key = udb.get(_)
+            key = str(key)
             new_ = [
                 int(z) if z.isdigit() or (z.startswith("-") and z[1:].isdigit()) else z
                 for z in key.split()
@@ -54,7 +54,20 @@ def load_other_plugins(addons=None, pmbot=None, manager=None, vcbot=None):
     # "INCLUDE_ONLY" was added to reduce Big List in "EXCLUDE_OFFICIAL" Plugin
     _in_only = udB.get_key("INCLUDE_ONLY") or config("INCLUDE_ONLY", None)
     _in_only = _in_only.split() if _in_only else []
-    Loader().load(include=_in_only, exclude=_exclude, after_load=_after_load)
+
+    # import plugins on first use of their commands
+    lazy = None
+    if udB.get_key("LAZY_PLUGINS") or config("LAZY_PLUGINS", default=False, cast=bool):
+        from .._misc._lazy import PluginManifest, register_lazy, settle_lazy
+
+        manifest = PluginManifest()
+
+        def lazy(plugin):
+            return register_lazy(plugin, manifest)
+
+    Loader().load(
+        include=_in_only, exclude=_exclude, after_load=_after_load, lazy=lazy
+    )
 
     # for assistant
     if not USER_MODE and not udB.get_key("DISABLE_AST_PLUGINS"):
@@ -137,3 +150,7 @@ def load_other_plugins(addons=None, pmbot=None, manager=None, vcbot=None):
                     LOGS.error(f"{e} Skipping VCBot Installation.")
         except (ModuleNotFoundError, ImportError):
             LOGS.error("'pytgcalls' (py-tgcalls) not installed!\nSkipping loading of VCBOT.")
+
+    if lazy:
+        manifest.save()
+        settle_lazy()
@@ -0,0 +1,80 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://www.github.com/TeamUltroid/Ultroid/blob/main/LICENSE/>.
+
+"""
+Compare encode/decode time of database codecs, on blobs shaped like
+'FILTERS', 'USERNAME_DB' and 'BOTCHAT'.
+
+Usage: python3 resources/benchmarks/db_codec.py [entries...]
+"""
+
+import os
+import sys
+from importlib.util import module_from_spec, spec_from_file_location
+from random import randint
+from timeit import repeat
+
+# Load codec module directly, as importing 'pyUltroid' starts the bot.
+_path = os.path.join(
+    os.path.dirname(__file__), "..", "..", "pyUltroid", "startup", "_codec.py"
+)
+spec = spec_from_file_location("_codec", _path)
+_codec = module_from_spec(spec)
+spec.loader.exec_module(_codec)
+
+
+def filters(count):
+    return {
+        -1001000000000 - chat: {
+            f"word{_}": {
+                "msg": f"Reply for word{_} in this chat.",
+                "media": None if _ % 3 else "https://graph.org/file/a1b2c3.jpg",
+                "button": None,
+            }
+            for _ in range(10)
+        }
+        for chat in range(count // 10)
+    }
+
+
+def username_db(count):
+    return {randint(10**8, 10**10): f"user_{_}" for _ in range(count)}
+
+
+def botchat(count):
+    data = {_: randint(10**8, 10**10) for _ in range(count)}
+    data["TAG"] = {_: [-1001000000000 - _, randint(10**8, 10**10)] for _ in range(count)}
+    return data
+
+
+def bench(func, number=5):
+    return min(repeat(func, number=number, repeat=3)) / number * 1000
+
+
+def main(sizes):
+    print(f"orjson: {'installed' if _codec.orjson else 'not installed'}\n")
+    print(f"{'key':<12}{'entries':>8}{'codec':>7}{'size':>10}{'encode':>11}{'decode':>11}")
+    for name, make in [
+        ("FILTERS", filters),
+        ("USERNAME_DB", username_db),
+        ("BOTCHAT", botchat),
+    ]:
+        for size in sizes:
+            value = make(size)
+            for codec in _codec.CODECS.values():
+                data = codec.encode(value)
+                assert _codec.decode(data) == value, codec.name
+                enc = bench(lambda: codec.encode(value))
+                dec = bench(lambda: _codec.decode(data))
+                print(
+                    f"{name:<12}{size:>8}{codec.name:>7}{len(data):>10}{enc:>9.2f}ms{dec:>9.2f}ms"
+                )
+    print()
+
+
+if __name__ == "__main__":
+    main([int(_) for _ in sys.argv[1:]] or [100, 1000, 10000])
@@ -1,5 +1,9 @@
+import asyncio
+import json
+import marshal
 import os
 import sys
+from functools import partial
 from glob import glob
 from typing import Any, Dict, List, Union
 
@@ -15,6 +19,45 @@ ULTConfig.lang = udB.get_key("language") or os.getenv("LANGUAGE", "en")
 
 languages = {}
 PATH = "strings/strings/{}.yml"
+# compiled language files, and machine translations of missing strings.
+CACHE = "resources/strings_cache"
+
+# lang -> {key: [english string, translation]}
+_translations = {}
+# (lang, key) yet to be translated, and ones which failed.
+_pending = set()
+_failed = set()
+_worker = None
+_meta = None
+
+
+def _write(path, dump, data, mode="w"):
+    os.makedirs(CACHE, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, mode) as file:
+        dump(data, file)
+    os.replace(tmp, path)
+
+
+def _compile(file, code):
+    """Strings of 'file', from its compiled bundle, if file is not changed since."""
+    stat = os.stat(file)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    bundle = os.path.join(CACHE, f"{code}.bin")
+    try:
+        with open(bundle, "rb") as cached:
+            cached_stamp, data = marshal.load(cached)
+        if cached_stamp == stamp:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    with open(file, encoding="UTF-8") as yml:
+        data = safe_load(yml)
+    try:
+        _write(bundle, marshal.dump, (stamp, data), "wb")
+    except (OSError, ValueError) as er:
+        LOGS.debug(f"Can't save compiled {code} strings: {er}")
+    return data
 
 
 def load(file):
@@ -24,43 +67,96 @@ def load(file):
         file = PATH.format("en")
     code = file.split("/")[-1].split("\\")[-1][:-4]
     try:
-        languages[code] = safe_load(
-            open(file, encoding="UTF-8"),
-        )
+        languages[code] = _compile(file, code)
     except Exception as er:
         LOGS.info(f"Error in {file[:-4]} language file")
         LOGS.exception(er)
 
 
-load(PATH.format(ULTConfig.lang))
+def _strings(lang):
+    if lang not in languages:
+        load(PATH.format(lang))
+        languages.setdefault(lang, {})
+    return languages[lang]
 
 
-def get_string(key: str, _res: bool = True) -> Any:
-    lang = ULTConfig.lang or "en"
+def _translated(lang):
+    if lang not in _translations:
+        try:
+            with open(os.path.join(CACHE, f"{lang}.translated.json")) as file:
+                _translations[lang] = json.load(file)
+        except (OSError, ValueError):
+            _translations[lang] = {}
+    return _translations[lang]
+
+
+def _save_translations(lang):
+    path = os.path.join(CACHE, f"{lang}.translated.json")
     try:
-        return languages[lang][key]
-    except KeyError:
+        _write(path, partial(json.dump, ensure_ascii=False), _translated(lang))
+    except OSError as er:
+        LOGS.debug(f"Can't save {lang} translations: {er}")
+
+
+async def _translate_pending():
+    loop = asyncio.get_running_loop()
+    changed = set()
+    while _pending:
+        lang, key = _pending.pop()
+        en_ = _strings("en").get(key)
         try:
-            en_ = languages["en"][key]
-            tr = translate(en_, lang_tgt=lang).replace("\ N", "\n")
-            if en_.count("{}") != tr.count("{}"):
-                tr = en_
-            if languages.get(lang):
-                languages[lang][key] = tr
-            else:
-                languages.update({lang: {key: tr}})
-            return tr
-        except KeyError:
-            if not _res:
-                return
-            return f"Warning: could not load any string with the key `{key}`"
-        except TypeError:
-            pass
+            tr = await loop.run_in_executor(
+                None, partial(translate, en_, lang_tgt=lang)
+            )
+            tr = tr.replace("\ N", "\n")
         except Exception as er:
-            LOGS.exception(er)
+            LOGS.debug(f"Can't translate '{key}' to {lang}: {er}")
+            _failed.add((lang, key))
+            continue
+        if en_.count("{}") != tr.count("{}"):
+            tr = en_
+        _translated(lang)[key] = [en_, tr]
+        changed.add(lang)
+    for lang in changed:
+        _save_translations(lang)
+
+
+def _queue_translation(lang, key):
+    """Translate string in background, English one is used till then."""
+    global _worker
+    if (lang, key) in _failed:
+        return
+    _pending.add((lang, key))
+    if _worker and not _worker.done():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # not in event loop, picked up by next call from it.
+        return
+    _worker = loop.create_task(_translate_pending())
+
+
+load(PATH.format(ULTConfig.lang))
+
+
+def get_string(key: str, _res: bool = True) -> Any:
+    lang = ULTConfig.lang or "en"
+    strings = _strings(lang)
+    if key in strings:
+        return strings[key]
+    en_ = _strings("en").get(key)
+    if en_ is None:
         if not _res:
-            return None
-        return languages["en"].get(key) or f"Failed to load language string '{key}'"
+            return
+        return f"Warning: could not load any string with the key `{key}`"
+    if not isinstance(en_, str):
+        return en_
+    translated = _translated(lang).get(key)
+    if translated and translated[0] == en_:
+        return translated[1]
+    _queue_translation(lang, key)
+    return en_
 
 
 def get_help(key):
@@ -70,13 +166,19 @@ def get_help(key):
 
 
 def get_languages() -> Dict[str, Union[str, List[str]]]:
-    for file in glob("strings/strings/*yml"):
-        load(file)
-    return {
-        code: {
-            "name": languages[code]["name"],
-            "natively": languages[code]["natively"],
-            "authors": languages[code]["authors"],
-        }
-        for code in languages
-    }
+    global _meta
+    if _meta is None:
+        _meta = {}
+        for file in sorted(glob("strings/strings/*yml")):
+            code = file.split("/")[-1].split("\\")[-1][:-4]
+            try:
+                data = languages.get(code) or _compile(file, code)
+                _meta[code] = {
+                    "name": data["name"],
+                    "natively": data["natively"],
+                    "authors": data["authors"],
+                }
+            except Exception as er:
+                LOGS.info(f"Error in {file[:-4]} language file")
+                LOGS.exception(er)
+    return _meta
@@ -0,0 +1,52 @@
+# Ultroid - UserBot
+# Copyright (C) 2021-2025 TeamUltroid
+#
+# This file is a part of < https://github.com/TeamUltroid/Ultroid/ >
+# PLease read the GNU Affero General Public License in
+# <https://github.com/TeamUltroid/pyUltroid/blob/main/LICENSE>.
+
+import asyncio
+import time
+
+from telethon.errors import FloodWaitError
+from telethon.tl.functions.messages import SendMessageRequest
+from telethon.tl.types import InputPeerChat
+
+from pyUltroid.startup._governor import RequestGovernor
+
+
+class StubSender:
+    """Raises a FloodWait on first request, like telegram would."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.requests = []
+
+    async def send(self, sender, request, ordered=False):
+        self.requests.append(request)
+        if len(self.requests) == 1:
+            raise FloodWaitError(request, capture=self.seconds)
+        return "sent"
+
+
+def test_flood_wait_is_recorded_per_chat():
+    floods = []
+    governor = RequestGovernor(
+        max_wait=1, on_flood=lambda request, per_chat: floods.append(per_chat)
+    )
+    stub = StubSender(5)
+    request = SendMessageRequest(InputPeerChat(1), "hi")
+
+    # wait is longer than 'max_wait', so it's raised instead of slept.
+    try:
+        asyncio.run(governor.call(stub.send, request, sender=object()))
+    except FloodWaitError as er:
+        assert er.seconds == 5
+    else:
+        raise AssertionError("FloodWaitError wasn't raised")
+
+    bucket = governor._buckets[("send", -1)]
+    assert 4 < bucket.until - time.monotonic() <= 5
+    assert floods == [True]
+    # other chats aren't held back.
+    assert ("send", -2) not in governor._buckets
@@ -85,7 +85,7 @@ from pyUltroid.fns.helper import (
 from pyUltroid.fns.admins import admin_check
 from pyUltroid.fns.tools import is_url_ok
 from pyUltroid.fns.ytdl import get_videos_link
-from pyUltroid._misc import owner_and_sudos, sudoers
+from pyUltroid._misc import SUDO_M, owner_and_sudos, sudoers
 from pyUltroid._misc._assistant import in_pattern
 from pyUltroid._misc._wrappers import eod, eor
 from pyUltroid.version import __version__ as UltVer
@@ -114,8 +114,7 @@ CLIENTS = {}
 
 
 def VC_AUTHS():
-    _vcsudos = udB.get_key("VC_SUDOS") or []
-    return [int(a) for a in [*owner_and_sudos(), *_vcsudos]]
+    return SUDO_M.vc_auths()
 
 
 class Player: